@@ -14,6 +14,10 @@ class Config:
         db_url = db_url.replace('postgresql://', 'postgresql+psycopg://', 1)
     SQLALCHEMY_DATABASE_URI = db_url
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # bcrypt work factor (each +1 doubles hashing time). 12 is bcrypt's own
+    # default; test runs can set e.g. BCRYPT_ROUNDS=4.
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
     
     # Session configuration - 24 hour duration
     SESSION_TYPE = 'filesystem'
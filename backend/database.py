@@ -1,7 +1,30 @@
-from sqlalchemy import create_engine
+import json
+
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session
 from config import Config
 
+try:
+    import orjson
+except ImportError:  # listed in requirements; stdlib json keeps bare checkouts working
+    orjson = None
+
+
+# JSONB columns (protein_features, validation_data, extra_metadata) round-trip
+# through these.  orjson is several times faster than stdlib json; numpy
+# scalars/arrays and non-str dict keys are accepted so values that json.dumps
+# handled (or that come straight out of pandas) still serialise.
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def json_dumps(value):
+        return orjson.dumps(value, option=_ORJSON_OPTIONS).decode()
+
+    json_loads = orjson.loads
+else:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
 _db_url = Config.SQLALCHEMY_DATABASE_URI
 _is_sqlite = _db_url.startswith('sqlite')
 
@@ -13,6 +36,8 @@ _connect_args = {"check_same_thread": False} if _is_sqlite else {"connect_timeou
 _engine_kwargs = dict(
     echo=False,
     connect_args=_connect_args,
+    json_serializer=json_dumps,
+    json_deserializer=json_loads,
 )
 if not _is_sqlite:
     _engine_kwargs["pool_pre_ping"] = True
@@ -36,3 +61,38 @@ def get_db():
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+
+def upgrade_schema(bind):
+    """
+    Bring tables that already existed up to the current models.
+
+    create_all() only creates missing tables, so columns and indexes added to
+    existing ones are applied here. Every step checks the live schema first,
+    so this is a no-op on fresh or already-upgraded databases.
+    """
+    tables = set(inspect(bind).get_table_names())
+
+    if 'variant_data' in tables:
+        columns = {c['name'] for c in inspect(bind).get_columns('variant_data')}
+        if 'mutation_count' not in columns:
+            with bind.begin() as conn:
+                conn.execute(text(
+                    "ALTER TABLE variant_data "
+                    "ADD COLUMN mutation_count INTEGER NOT NULL DEFAULT 0"
+                ))
+                # Backfill from the mutations already stored
+                conn.execute(text(
+                    "UPDATE variant_data SET mutation_count = "
+                    "(SELECT count(*) FROM mutations "
+                    "WHERE mutations.variant_id = variant_data.id)"
+                ))
+
+    # Indexes declared on tables that predate them
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
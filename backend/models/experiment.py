@@ -1,8 +1,8 @@
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Float, Boolean, Integer
+from sqlalchemy import event, DDL, Column, String, DateTime, Text, ForeignKey, Float, Boolean, Integer, Index, insert
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
-from database import Base
+from sqlalchemy.orm import relationship, selectinload
+from database import Base, json_dumps
 import uuid
 import math
 
@@ -20,6 +20,41 @@ def safe_float(value):
     return value
 
 
+def _copy_records(table, columns, rows):
+    """
+    Complete each row dict for a bulk COPY/executemany of ``columns``.
+
+    Those bypass SQLAlchemy's and the server's column defaults, so a missing
+    (or None) value is filled from the column's Python default here; a
+    missing value for a NOT NULL column without one raises ValueError
+    instead of surfacing later as a database error.
+    """
+    fill = []
+    for name in columns:
+        column = table.c[name]
+        default = column.default
+        if default is not None and default.is_scalar:
+            fill.append((name, lambda value=default.arg: value, False))
+        elif default is not None and default.is_callable:
+            fill.append((name, lambda fn=default.arg: fn(None), False))
+        else:
+            fill.append((name, None, not column.nullable))
+
+    records = []
+    for row in rows:
+        record = {}
+        for name, make_default, required in fill:
+            value = row.get(name)
+            if value is None:
+                if make_default is not None:
+                    value = make_default()
+                elif required:
+                    raise ValueError(f"{table.name}.{name} is required for bulk insert")
+            record[name] = value
+        records.append(record)
+    return records
+
+
 class Experiment(Base):
     """
     Represents a single directed evolution experiment.
@@ -112,6 +147,9 @@ class VariantData(Base):
     # Computed fields
     protein_sequence = Column(Text, nullable=True)  # Translated from DNA
     activity_score = Column(Float, nullable=True, index=True)
+    # Denormalised len(mutations), kept in step by upload and analysis, so
+    # listings can report it without touching the mutations table
+    mutation_count = Column(Integer, nullable=False, default=0, server_default='0')
     
     # QC status
     qc_status = Column(String(20), nullable=False, default='pending')  # passed, failed
@@ -128,6 +166,76 @@ class VariantData(Base):
     # Relationships
     
     mutations = relationship("Mutation", back_populates="variant", cascade="all, delete-orphan", lazy="select")
+
+    # Column order for bulk_copy — COPY streams values positionally
+    _COPY_COLUMNS = (
+        'id', 'experiment_id', 'plasmid_variant_index', 'parent_plasmid_variant',
+        'generation', 'assembled_dna_sequence', 'dna_yield', 'protein_yield',
+        'is_control', 'protein_sequence', 'activity_score', 'qc_status',
+        'qc_message', 'extra_metadata', 'mutation_count', 'created_at',
+    )
+
+    __table_args__ = (
+        # "top variants per generation" views filter on experiment and
+        # generation and order by activity
+        Index('ix_variant_exp_gen_activity', experiment_id, generation, activity_score.desc()),
+    )
+
+    @classmethod
+    def query_with_mutations(cls, session, experiment_id):
+        """
+        Query an experiment's variants with ``mutations`` eager-loaded.
+
+        selectinload fetches every listed variant's mutations in one extra
+        ``WHERE variant_id IN (...)`` query, so serialising with
+        ``include_mutations=True`` never falls back to one lazy SELECT per
+        variant. Unlike joinedload it doesn't multiply the variant rows (and
+        their sequences) by the mutation count, and LIMIT still applies to
+        variants.
+        """
+        return (
+            session.query(cls)
+            .options(selectinload(cls.mutations))
+            .filter(cls.experiment_id == experiment_id)
+        )
+
+    @classmethod
+    def bulk_copy(cls, session, experiment_id, rows):
+        """
+        Insert many variants for one experiment and return their ids in order.
+
+        ``rows`` are dicts keyed by column name; missing values take the
+        column's default (see ``_copy_records``). ``id`` and ``created_at`` are
+        assigned client-side, so callers can attach Mutation rows to the new
+        variants without reading them back. On PostgreSQL the rows are
+        streamed through ``COPY ... FROM STDIN`` (one protocol round-trip, no
+        per-row INSERT); other backends get a single executemany INSERT.
+        Runs inside the session's current transaction — the caller commits.
+        """
+        records = _copy_records(
+            cls.__table__, cls._COPY_COLUMNS,
+            (dict(row, experiment_id=experiment_id) for row in rows),
+        )
+        for record in records:
+            # numpy/pandas booleans from the upload frame aren't COPY-able
+            record['is_control'] = bool(record['is_control'])
+
+        if not records:
+            return []
+
+        conn = session.connection()
+        if conn.dialect.name == 'postgresql':
+            columns = ', '.join(cls._COPY_COLUMNS)
+            with conn.connection.cursor() as cur:
+                with cur.copy(f"COPY {cls.__tablename__} ({columns}) FROM STDIN") as copy:
+                    for record in records:
+                        meta = record['extra_metadata']
+                        record['extra_metadata'] = json_dumps(meta) if meta is not None else None
+                        copy.write_row([record[col] for col in cls._COPY_COLUMNS])
+        else:
+            conn.execute(insert(cls), records)
+
+        return [record['id'] for record in records]
     
     def to_dict(self, include_sequences=False, include_mutations=False):
         """Convert variant to dictionary"""
@@ -154,12 +262,8 @@ class VariantData(Base):
             data['mutations'] = [m.to_dict() for m in self.mutations] if self.mutations else []
             data['mutationCount'] = len(data['mutations'])
         else:
-            # Avoid firing a lazy-load query just for the count.
-            # SQLAlchemy stores loaded relationship collections in __dict__.
-            if 'mutations' in self.__dict__:
-                data['mutationCount'] = len(self.__dict__['mutations'])
-            else:
-                data['mutationCount'] = 0
+            # Stored count — never touches self.mutations (no lazy load)
+            data['mutationCount'] = self.mutation_count or 0
 
         if include_sequences:
             data['assembledDNASequence'] = self.assembled_dna_sequence
@@ -173,7 +277,8 @@ class Mutation(Base):
     __tablename__ = 'mutations'
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    variant_id = Column(UUID(as_uuid=True), ForeignKey('variant_data.id', ondelete='CASCADE'), nullable=False, index=True)
+    # Indexed through ix_mutations_variant_pos (variant_id is its leading column)
+    variant_id = Column(UUID(as_uuid=True), ForeignKey('variant_data.id', ondelete='CASCADE'), nullable=False)
     
     position = Column(Integer, nullable=False)
     wild_type = Column(String(1), nullable=False)  # Single amino acid (WT)
@@ -186,6 +291,44 @@ class Mutation(Base):
     
     # Relationships
     variant = relationship("VariantData", back_populates="mutations")
+
+    __table_args__ = (
+        Index('ix_mutations_variant_pos', variant_id, position),
+    )
+
+    # Column order for bulk_copy — COPY streams values positionally
+    _COPY_COLUMNS = (
+        'id', 'variant_id', 'position', 'wild_type', 'mutant', 'wt_codon',
+        'mut_codon', 'mut_aa', 'mutation_type', 'generation_introduced',
+    )
+
+    @classmethod
+    def bulk_copy(cls, session, rows):
+        """
+        Insert many mutations and return how many were written.
+
+        ``rows`` are dicts keyed by column name whose ``variant_id`` points at
+        an existing (or same-transaction) variant — typically ids handed back
+        by ``VariantData.bulk_copy``; missing values (including ``id``) take
+        the column's default. PostgreSQL gets one ``COPY ... FROM
+        STDIN`` stream; other backends a single executemany INSERT. Runs
+        inside the session's current transaction — the caller commits.
+        """
+        records = _copy_records(cls.__table__, cls._COPY_COLUMNS, rows)
+        if not records:
+            return 0
+
+        conn = session.connection()
+        if conn.dialect.name == 'postgresql':
+            columns = ', '.join(cls._COPY_COLUMNS)
+            with conn.connection.cursor() as cur:
+                with cur.copy(f"COPY {cls.__tablename__} ({columns}) FROM STDIN") as copy:
+                    for record in records:
+                        copy.write_row([record[col] for col in cls._COPY_COLUMNS])
+        else:
+            conn.execute(insert(cls), records)
+
+        return len(records)
     
     def to_dict(self):
         """Convert mutation to dictionary"""
@@ -199,3 +342,32 @@ class Mutation(Base):
             'type': self.mutation_type,
             'generation': self.generation_introduced,
         }
+
+
+# Sequence columns hold long, low-entropy ASCII that PostgreSQL TOASTs and
+# compresses anyway. lz4 compresses it about as well as the default pglz but
+# decompresses several times faster, which is what every include_sequences
+# read pays for. Applied when create_all makes the tables, and only where the
+# server supports it (PostgreSQL 14+, built with lz4); elsewhere the columns
+# keep the default compression.
+def _lz4_supported(ddl, target, bind, **kw):
+    if bind is None or (bind.dialect.server_version_info or (0,)) < (14,):
+        return False
+    return bool(bind.exec_driver_sql(
+        "SELECT 'lz4' = ANY(enumvals) FROM pg_settings "
+        "WHERE name = 'default_toast_compression'"
+    ).scalar())
+
+
+def _lz4_compress_columns(table, *columns):
+    alters = ', '.join(f'ALTER COLUMN {col} SET COMPRESSION lz4' for col in columns)
+    event.listen(
+        table, 'after_create',
+        DDL(f'ALTER TABLE {table.name} {alters}').execute_if(
+            dialect='postgresql', callable_=_lz4_supported,
+        ),
+    )
+
+
+_lz4_compress_columns(Experiment.__table__, 'wt_protein_sequence', 'plasmid_sequence')
+_lz4_compress_columns(VariantData.__table__, 'assembled_dna_sequence', 'protein_sequence')
@@ -1,12 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cache
 from typing import Optional
+import os
 import bcrypt
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.dialects.postgresql import UUID
+from config import Config
 from database import Base
 import uuid
 
 
+# bcrypt is deliberately CPU-bound (and releases the GIL while hashing).
+# Routing every hash/check through one pool sized to the core count stops a
+# burst of logins from oversubscribing the CPUs and stretching everyone's
+# latency; excess requests queue here instead.
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='bcrypt')
+
+
 class User(Base):
     """
     Stores registered user accounts.
@@ -37,13 +48,27 @@ class User(Base):
         bcrypt automatically generates and embeds a random salt - two
         identical passwords will produce different hashes.
         """
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        salt = bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)
+        hashed = _BCRYPT_POOL.submit(bcrypt.hashpw, password.encode('utf-8'), salt).result()
+        return hashed.decode('utf-8')
     
+    @staticmethod
+    @cache
+    def dummy_password_hash() -> str:
+        """
+        A valid hash of a throwaway password at the configured cost.
+        Checking against it when an email is unknown makes a failed login
+        take as long as a wrong password, so response times don't reveal
+        which emails are registered. Built once, on first use.
+        """
+        return User.hash_password(uuid.uuid4().hex)
+
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
         """
         Verify a plaintext password against a stored bcrypt hash at login.
         bcrypt.checkpw handles extracting emdbed from hash
         """
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        return _BCRYPT_POOL.submit(
+            bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8')
+        ).result()
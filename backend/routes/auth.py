@@ -1,14 +1,25 @@
 from flask import Blueprint, request, jsonify, session
 from services.user_service import user_service
-import re
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 
 def validate_email(email: str) -> bool:
-    """Validate email format"""
-    pattern = r'^[^\s@]+@[^\s@]+\.[^\s@]+$'
-    return re.match(pattern, email) is not None
+    """
+    Validate email format: exactly one '@' with text before it, a '.' inside
+    the domain, and no whitespace. Plain string scans, no regex.
+    """
+    # 254 is the longest address SMTP can carry (RFC 5321)
+    if not email or len(email) > 254:
+        return False
+    at = email.find('@')
+    if at <= 0 or at != email.rfind('@'):
+        return False
+    # the domain needs a '.' with at least one character either side
+    if '.' not in email[at + 2:-1]:
+        return False
+    # str.split() splits (or strips) on any Unicode whitespace
+    return email.split(maxsplit=1) == [email]
 
 
 @auth_bp.route('/register', methods=['POST'])
@@ -21,6 +21,7 @@ import threading
 import time
 
 from flask import request, jsonify, current_app
+from sqlalchemy import update
 
 from database import db
 from models.experiment import Experiment, VariantData, Mutation
@@ -119,10 +120,10 @@ def _run_analysis_background(app, exp_id, wt_protein_seq: str, plasmid_seq: str)
                     this_muts[key] = parent_muts.get(key, v.generation)
                 idx_to_mutations[v.plasmid_variant_index] = this_muts
 
-            # ── Build new Mutation objects (all computation before any DB write) ─
+            # ── Build new mutation rows (all computation before any DB write) ──
             new_mutations = []
             protein_updates = {}
-            BATCH_SIZE = 200
+            mutation_counts = {}
 
             for result in analyzed:
                 variant = variant_dict.get(result['id'])
@@ -130,22 +131,23 @@ def _run_analysis_background(app, exp_id, wt_protein_seq: str, plasmid_seq: str)
                     continue
 
                 protein_updates[result['id']] = result.get('protein_sequence')
+                mutation_counts[result['id']] = len(result.get('mutations', []))
 
                 gen_map = idx_to_mutations.get(variant.plasmid_variant_index, {})
                 for mut in result.get('mutations', []):
                     key = (mut['position'], mut['wt_aa'], mut['mut_aa'])
                     gen_introduced = gen_map.get(key, variant.generation)
-                    new_mutations.append(Mutation(
-                        variant_id=variant.id,
-                        position=mut['position'],
-                        wild_type=mut['wt_aa'],
-                        mutant=mut['mut_aa'],
-                        wt_codon=mut.get('wt_codon'),
-                        mut_codon=mut.get('mut_codon'),
-                        mut_aa=mut.get('mut_aa'),
-                        mutation_type=mut.get('mutation_type', 'non-synonymous'),
-                        generation_introduced=gen_introduced,
-                    ))
+                    new_mutations.append({
+                        'variant_id': variant.id,
+                        'position': mut['position'],
+                        'wild_type': mut['wt_aa'],
+                        'mutant': mut['mut_aa'],
+                        'wt_codon': mut.get('wt_codon'),
+                        'mut_codon': mut.get('mut_codon'),
+                        'mut_aa': mut.get('mut_aa'),
+                        'mutation_type': mut.get('mutation_type', 'non-synonymous'),
+                        'generation_introduced': gen_introduced,
+                    })
 
             print(f"[BG] Built {len(new_mutations)} mutations for "
                   f"{len(protein_updates)} variants — writing to DB...")
@@ -155,26 +157,33 @@ def _run_analysis_background(app, exp_id, wt_protein_seq: str, plasmid_seq: str)
             # all existing Mutation rows for these variants first.  Doing the
             # deletes and inserts together in one transaction means the DB is
             # never in a half-written state if the process is interrupted.
-            updated_count = 0
             if variant_ids:
                 deleted = db.query(Mutation).filter(
                     Mutation.variant_id.in_(variant_ids)
                 ).delete(synchronize_session=False)
                 print(f"[BG] Deleted {deleted} old mutations")
 
-            for result_id, new_protein in protein_updates.items():
-                variant = variant_dict.get(result_id)
-                if variant:
-                    variant.protein_sequence = new_protein
-                    updated_count += 1
-                    if updated_count % BATCH_SIZE == 0:
-                        db.flush()
-                        print(f"[BG] Flushed protein sequences: "
-                              f"{updated_count}/{len(protein_updates)}")
-
+            # One UPDATE-by-primary-key executemany for every variant rather
+            # than a unit-of-work flush per dirty object (psycopg pipelines
+            # the batch).  Old mutation rows are gone for every variant, so
+            # every count is reset; unanalysed variants keep their protein.
+            updated_count = len(protein_updates)
+            if variants:
+                db.execute(update(VariantData), [
+                    {
+                        'id': v.id,
+                        'protein_sequence': protein_updates.get(str(v.id), v.protein_sequence),
+                        'mutation_count': mutation_counts.get(str(v.id), 0),
+                    }
+                    for v in variants
+                ])
+                print(f"[BG] Updated protein sequences: "
+                      f"{updated_count}/{len(variants)}")
+
+            # One COPY stream on the same transaction as the delete above
             if new_mutations:
-                db.add_all(new_mutations)
-                print(f"[BG] Staged {len(new_mutations)} mutations for insert")
+                Mutation.bulk_copy(db, new_mutations)
+                print(f"[BG] Copied {len(new_mutations)} mutations")
 
             db.commit()
             print(f"[BG] Database update complete: "
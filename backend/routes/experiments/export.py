@@ -37,7 +37,6 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from flask import request, jsonify, send_file, session
-from sqlalchemy.orm import joinedload as _jl
 
 from database import db
 from models.experiment import VariantData
@@ -64,11 +63,9 @@ def export_mutations_csv(experiment_id: str):
 
         exp_uuid = uuid.UUID(experiment_id) if isinstance(experiment_id, str) else experiment_id
 
-        # Single query — avoids N+1
+        # Two queries (variants + one IN-list for mutations) — avoids N+1
         variants = (
-            db.query(VariantData)
-            .filter(VariantData.experiment_id == exp_uuid)
-            .options(_jl(VariantData.mutations))
+            VariantData.query_with_mutations(db, exp_uuid)
             .order_by(
                 VariantData.generation.asc(),
                 VariantData.plasmid_variant_index.asc(),
@@ -66,8 +66,9 @@ def upload_experimental_data(experiment_id: str):
        control wells as the generation baseline.
     3. **Prepare** – finalize records (sequence analysis is *deferred* until
        the user explicitly triggers ``/analyze-sequences``).
-    4. **Store** – write ``VariantData`` + ``Mutation`` rows to PostgreSQL in
-       batches of 50 to avoid overly large transactions.
+    4. **Store** – stream all ``VariantData`` rows, then any ``Mutation``
+       rows, to PostgreSQL with one ``COPY`` each (``VariantData.bulk_copy``
+       / ``Mutation.bulk_copy``) and commit them in a single transaction.
     5. **Respond** – return parse/QC/generation statistics to the frontend.
 
     The ``column_mapping`` body field is optional.  When present it carries the
@@ -194,30 +195,29 @@ def upload_experimental_data(experiment_id: str):
         analyzed_variants = valid_df.to_dict('records')
         analyzed_controls = control_scored_df.to_dict('records') if not control_scored_df.empty else []
 
-        # Step 4: Store in database in batches
+        # Step 4: Store in database
         print(f"Step 4: Storing {len(analyzed_variants)} variants and "
               f"{len(analyzed_controls)} controls in database...")
-        stored_count = 0
         metadata_columns = parse_summary['metadata_columns']
-        BATCH_SIZE = 50
 
         all_records = analyzed_variants + analyzed_controls
 
-        for idx, variant_data in enumerate(all_records):
-            variant = VariantData(
-                experiment_id=exp_id,
-                plasmid_variant_index=variant_data['plasmid_variant_index'],
-                parent_plasmid_variant=variant_data.get('parent_plasmid_variant'),
-                generation=int(variant_data['generation']),
-                assembled_dna_sequence=variant_data['assembled_dna_sequence'],
-                dna_yield=variant_data['dna_yield'],
-                protein_yield=variant_data['protein_yield'],
-                is_control=variant_data['is_control'],
-                protein_sequence=variant_data.get('protein_sequence'),
-                activity_score=variant_data.get('activity_score'),
-                qc_status='passed',
-                qc_message=None
-            )
+        variant_rows = []
+        for variant_data in all_records:
+            row = {
+                'plasmid_variant_index': variant_data['plasmid_variant_index'],
+                'parent_plasmid_variant': variant_data.get('parent_plasmid_variant'),
+                'generation': int(variant_data['generation']),
+                'assembled_dna_sequence': variant_data['assembled_dna_sequence'],
+                'dna_yield': variant_data['dna_yield'],
+                'protein_yield': variant_data['protein_yield'],
+                'is_control': variant_data['is_control'],
+                'protein_sequence': variant_data.get('protein_sequence'),
+                'activity_score': variant_data.get('activity_score'),
+                'qc_status': 'passed',
+                'qc_message': None,
+                'mutation_count': len(variant_data.get('mutations', [])),
+            }
 
             # Store extra metadata — coerce NaN/inf to None for JSON safety
             if metadata_columns:
@@ -229,26 +229,30 @@ def upload_experimental_data(experiment_id: str):
                     if isinstance(val, float) and (_math.isnan(val) or _math.isinf(val)):
                         val = None
                     metadata[col] = val
-                variant.extra_metadata = metadata or None
-
-            for mut in variant_data.get('mutations', []):
-                mutation = Mutation(
-                    position=mut['position'],
-                    wild_type=mut['wt_aa'],
-                    mutant=mut['mut_aa'],
-                    mutation_type=mut.get('mutation_type', 'non-synonymous'),
-                    generation_introduced=variant_data['generation']
-                )
-                variant.mutations.append(mutation)
-
-            db.add(variant)
-            stored_count += 1
-
-            if (idx + 1) % BATCH_SIZE == 0:
-                db.commit()
-                print(f"  Committed batch: {stored_count}/{len(all_records)} records")
+                row['extra_metadata'] = metadata or None
+
+            variant_rows.append(row)
+
+        # One COPY stream for every variant, in a single transaction. ids are
+        # generated client-side, so any mutations can reference their variant
+        # straight away.
+        variant_ids = VariantData.bulk_copy(db, exp_id, variant_rows)
+
+        Mutation.bulk_copy(db, (
+            {
+                'variant_id': variant_id,
+                'position': mut['position'],
+                'wild_type': mut['wt_aa'],
+                'mutant': mut['mut_aa'],
+                'mutation_type': mut.get('mutation_type', 'non-synonymous'),
+                'generation_introduced': int(variant_data['generation']),
+            }
+            for variant_id, variant_data in zip(variant_ids, all_records)
+            for mut in variant_data.get('mutations', [])
+        ))
 
         db.commit()
+        stored_count = len(variant_ids)
         print(f"Database commit successful. "
               f"Stored {len(analyzed_variants)} variants + {len(analyzed_controls)} controls "
               f"= {stored_count} total records.")
@@ -11,7 +11,6 @@ import uuid
 from database import db
 from models.experiment import VariantData
 from services.experiment_service import experiment_service
-from sqlalchemy.orm import joinedload
 from ._base import experiments_bp, require_auth
 
 
@@ -31,9 +30,12 @@ def get_experiment_variants(experiment_id: str):
         limit = min(int(request.args.get('limit', 1000)), 5000)
         include_mutations = request.args.get('include_mutations', 'false').lower() == 'true'
 
-        variants = db.query(VariantData).filter_by(
-            experiment_id=exp_uuid
-        ).order_by(
+        if include_mutations:
+            query = VariantData.query_with_mutations(db, exp_uuid)
+        else:
+            query = db.query(VariantData).filter_by(experiment_id=exp_uuid)
+
+        variants = query.order_by(
             VariantData.generation.asc(),
             # nullslast() is a SQLAlchemy helper that moves rows with a NULL
             # activity_score (i.e. controls and un-analysed uploads) to the
@@ -67,12 +69,12 @@ def get_top_performers(experiment_id: str):
 
         exp_uuid = uuid.UUID(experiment_id) if isinstance(experiment_id, str) else experiment_id
 
-        query = db.query(VariantData)
         if include_mutations:
-            query = query.options(joinedload(VariantData.mutations))
+            query = VariantData.query_with_mutations(db, exp_uuid)
+        else:
+            query = db.query(VariantData).filter_by(experiment_id=exp_uuid)
 
         variants = query.filter_by(
-            experiment_id=exp_uuid,
             is_control=False
         ).filter(
             VariantData.activity_score.isnot(None)
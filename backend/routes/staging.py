@@ -6,6 +6,8 @@ Provides the HTTP interface for the experiment staging workflow:
 """
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 from flask import Blueprint, request, jsonify
 
 # Import so that tests can monkeypatch `staging_routes.stage_experiment_validate_plasmid`
@@ -13,6 +15,12 @@ from services.staging import stage_experiment_validate_plasmid  # noqa: F401
 
 staging_bp = Blueprint("staging", __name__, url_prefix="/staging")
 
+# Batch requests (a list of accessions against one plasmid) run this many
+# stagings at once: each one blocks on UniProt round-trips, so overlapping
+# them turns serial network latency into roughly the slowest single fetch.
+_MAX_BATCH_ACCESSIONS = 50
+_BATCH_WORKERS = 8
+
 
 @staging_bp.post("/api/staging")
 def staging_validate():
@@ -20,12 +28,14 @@ def staging_validate():
     Validate that a plasmid encodes a UniProt WT protein.
 
     Request JSON body:
-      accession      (str, required) — UniProt accession, e.g. "O34996"
+      accession      (str or list[str], required) — UniProt accession, e.g. "O34996";
+                     a list stages each accession against the same plasmid
       plasmid_fasta  (str, required) — FASTA text of the plasmid DNA
       fetch_features (bool, optional, default true)
 
     Response 200:
       {accession, wt_protein, features, validation, error}
+      (a list of these, in request order, when accession is a list)
     Response 400:
       {error: "..."}
     """
@@ -35,13 +45,24 @@ def staging_validate():
 
     body = request.get_json(silent=True) or {}
 
-    accession: str = (body.get("accession") or "").strip()
+    raw_accession = body.get("accession")
+    accessions: list[str] | None = None
+    if isinstance(raw_accession, list):
+        accessions = [str(a or "").strip() for a in raw_accession]
+        accession = accessions[0] if accessions and all(accessions) else ""
+    else:
+        accession = (raw_accession or "").strip()
     plasmid_fasta: str = (body.get("plasmid_fasta") or "").strip()
     fetch_features: bool = bool(body.get("fetch_features", True))
 
     if not accession or not plasmid_fasta:
         return jsonify({"error": "accession and plasmid_fasta are required"}), 400
 
+    if accessions is not None and len(accessions) > _MAX_BATCH_ACCESSIONS:
+        return jsonify({
+            "error": f"At most {_MAX_BATCH_ACCESSIONS} accessions can be staged per request."
+        }), 400
+
     if len(plasmid_fasta) > _MAX_PLASMID_BYTES:
         return jsonify({
             "error": (
@@ -54,6 +75,19 @@ def staging_validate():
 
     # Allow tests (and the route itself) to monkeypatch this module-level name
     import routes.staging as _self
+
+    if accessions is not None:
+        def _stage(acc: str) -> dict:
+            return _self.stage_experiment_validate_plasmid(
+                acc,
+                plasmid_fasta,
+                fetch_features=fetch_features,
+            )
+
+        with ThreadPoolExecutor(max_workers=min(_BATCH_WORKERS, len(accessions))) as pool:
+            results = list(pool.map(_stage, accessions))
+        return jsonify(results), 200
+
     result = _self.stage_experiment_validate_plasmid(
         accession,
         plasmid_fasta,
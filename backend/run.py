@@ -8,6 +8,7 @@ if sys.stderr and hasattr(sys.stderr, 'buffer'):
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_session import Session
 from config import Config
@@ -16,16 +17,41 @@ from routes.experiments import experiments_bp
 from routes.uniprot import uniprot_bp
 from routes.landscape import landscape_bp
 from routes.staging import staging_bp
-from database import init_db, db
+from database import init_db, db, orjson
 
 # Import models to register them with Base before init_db
 from models import User, Experiment, VariantData, Mutation
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() backed by orjson.
+
+    Types orjson can't encode natively (and datetimes, to keep Flask's HTTP
+    date format) are handed to Flask's default hook, so responses match the
+    stdlib provider apart from whitespace.
+    """
+
+    _options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+    def dumps(self, obj, **kwargs):
+        option = self._options
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 def create_app():
     """Create and configure the Flask application"""
     app = Flask(__name__)
     app.config.from_object(Config)
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
     
     # Initialize extensions
     CORS(app, origins=app.config['CORS_ORIGINS'], supports_credentials=True)
@@ -16,6 +16,10 @@ class FastaParseError(DirectedEvolutionPortalError):
     """Raised when a FASTA file cannot be parsed into valid records."""
 
 
+class FastaTooLargeError(FastaParseError):
+    """Raised when streamed FASTA input exceeds the caller's byte limit."""
+
+
 class InvalidSequenceError(DirectedEvolutionPortalError):
     """Raised when a parsed sequence contains invalid characters or is empty."""
 
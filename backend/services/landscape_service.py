@@ -4,12 +4,16 @@ landscape_service.py
 Activity landscape computation matching the logic in 3d_landscape.py.
 
 Key design decisions (mirroring the original):
-  - Amino-acid trigram CountVectorizer encoding captures local sequence
-    patterns (e.g. active-site motifs) without requiring structural data.
+  - Amino-acid trigram count encoding captures local sequence patterns
+    (e.g. active-site motifs) without requiring structural data. Counts are
+    built with NumPy and match CountVectorizer's output exactly.
   - TruncatedSVD operates directly on the sparse trigram matrix avoiding
     the memory cost of converting to a dense array for standard PCA.
-  - t-SNE embeddings are cached to disk keyed by a SHA-1 of the sequences
-    and parameters; recomputation on every request would be unusable.
+  - t-SNE runs on a 50-D TruncatedSVD projection of the trigram counts and
+    uses openTSNE's FFT-accelerated gradient when it is installed.
+  - t-SNE embeddings are cached to disk keyed by a BLAKE2b digest of the
+    sequences and parameters; recomputation on every request would be
+    unusable. The trigram matrix is cached alongside as .npz.
   - One surface frame is generated per generation using cumulative data
     (gen <= x), so the slider shows the landscape growing over rounds.
   - Three z-mode transforms share a single global colour scale so the
@@ -29,8 +33,10 @@ from typing import Any
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from scipy.interpolate import griddata
-from scipy.ndimage import gaussian_filter
+from scipy import sparse
+from scipy.interpolate import LinearNDInterpolator
+from scipy.ndimage import correlate1d
+from scipy.spatial import Delaunay, cKDTree
 from sklearn.decomposition import TruncatedSVD
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.manifold import TSNE
@@ -40,6 +46,7 @@ _CACHE_ROOT = Path(__file__).resolve().parents[1] / "instance" / "embedding_cach
 _CACHE_ROOT.mkdir(parents=True, exist_ok=True)
 
 _K = 3          # trigram length
+_TSNE_SVD_DIMS = 50  # t-SNE runs on this many SVD components, not raw counts
 # Grid size and initial z-mode respect the same env vars as the original 3d_landscape.py
 _GRID_SIZE = int(os.getenv("ACTIVITY_GRID_SIZE", "120"))  # 120×120 matches original
 _INITIAL_Z_MODE = os.getenv("ACTIVITY_Z_MODE", "robust").strip().lower()
@@ -51,62 +58,145 @@ if _INITIAL_Z_MODE not in {"raw", "normalized", "robust"}:
 # Encoding
 # ---------------------------------------------------------------------------
 
-def _trigram_encode(sequences: list[str]):
-    """Encode protein sequences as character-trigram count vectors (sparse)."""
-    vec = CountVectorizer(analyzer="char", ngram_range=(_K, _K), lowercase=False)
-    return vec.fit_transform(sequences)
+def _trigram_encode(sequences: list[str], seq_key: str):
+    """
+    Encode protein sequences as character-trigram count vectors (sparse).
+    Cached as .npz next to the embeddings so a miss on one embedding method
+    does not re-tokenise sequences another method has already seen.
+    """
+    cache = _cache_path(seq_key, "trigram", ext="npz")
+    if cache.exists():
+        return sparse.load_npz(cache)
+    X = _kmer_counts(sequences, _K)
+    sparse.save_npz(cache, X)
+    return X
+
+
+def _kmer_counts(sequences: list[str], k: int):
+    """
+    Character k-mer counts identical to CountVectorizer(analyzer="char",
+    ngram_range=(k, k), lowercase=False), built in one NumPy pass: each k-mer's
+    bytes are packed into an int64, so sorting the codes reproduces
+    CountVectorizer's sorted vocabulary. Non-ASCII or whitespace-containing
+    input goes through CountVectorizer, whose text normalisation differs.
+    """
+    joined = "".join(sequences)
+    if k > 7 or not joined.isascii() or any(c.isspace() for c in set(joined)):
+        vec = CountVectorizer(analyzer="char", ngram_range=(k, k), lowercase=False)
+        return vec.fit_transform(sequences)
+
+    buf = np.frombuffer(joined.encode("ascii"), dtype=np.uint8).astype(np.int64)
+    lengths = np.fromiter((len(s) for s in sequences), dtype=np.int64, count=len(sequences))
+    owner = np.repeat(np.arange(len(sequences)), lengths)
+
+    n = buf.size - k + 1
+    if n <= 0:
+        return sparse.csr_matrix((len(sequences), 0), dtype=np.int64)
+    codes = np.zeros(n, dtype=np.int64)
+    for j in range(k):
+        codes = (codes << 8) | buf[j:j + n]
+
+    # drop k-mers that straddle two neighbouring sequences
+    keep = owner[:n] == owner[k - 1:]
+    vocab, cols = np.unique(codes[keep], return_inverse=True)
+    return sparse.csr_matrix(
+        (np.ones(cols.size, dtype=np.int64), (owner[:n][keep], cols)),
+        shape=(len(sequences), vocab.size),
+    )
 
 
 # ---------------------------------------------------------------------------
 # Dimensionality reduction with disk cache
 # ---------------------------------------------------------------------------
 
-def _cache_path(sequences: list[str], method: str, **params) -> Path:
-    sig = hashlib.sha1()
+def _sequence_key(sequences: list[str]) -> str:
+    """
+    Digest of the sequence list. pandas hashes every string in C, so only
+    the fixed-width hash array goes through BLAKE2b rather than one Python
+    update() per sequence.
+    """
+    hashes = pd.util.hash_pandas_object(pd.Series(sequences, dtype=object), index=False)
+    return hashlib.blake2b(hashes.to_numpy().tobytes(), digest_size=20).hexdigest()
+
+
+def _cache_path(seq_key: str, method: str, ext: str = "npy", **params) -> Path:
+    sig = hashlib.blake2b(digest_size=20)
     sig.update(str(_K).encode())
     sig.update(method.encode())
-    for s in sequences:
-        sig.update(s.encode("utf-8", errors="ignore"))
-        sig.update(b"|")
+    sig.update(seq_key.encode())
     for k, v in sorted(params.items()):
         sig.update(f"{k}:{v}".encode())
-    return _CACHE_ROOT / f"{method}_{sig.hexdigest()}.npy"
+    return _CACHE_ROOT / f"{method}_{sig.hexdigest()}.{ext}"
+
+
+def _tsne_input(X) -> np.ndarray:
+    """
+    Dense 50-D TruncatedSVD projection of the sparse trigram matrix; t-SNE's
+    neighbour search is far cheaper here than across the full vocabulary.
+    """
+    if min(X.shape) <= _TSNE_SVD_DIMS:
+        return X.toarray()
+    return TruncatedSVD(n_components=_TSNE_SVD_DIMS, random_state=0).fit_transform(X)
+
+
+def _load_embedding(cache: Path) -> np.ndarray:
+    # memory-mapped: the caller copies the two columns straight into its
+    # DataFrame, so the cached array never needs to sit in RSS on its own
+    return np.load(cache, mmap_mode="r")
 
 
 def _reduce_to_2d(sequences: list[str], method: str) -> np.ndarray:
     """
     Reduce sequences to 2-D coordinates via trigram encoding + chosen method.
-    Cached on disk to avoid recomputing expensive t-SNE runs.
+    Cached on disk to avoid recomputing expensive t-SNE runs; the trigram
+    matrix is only built (or loaded) when the embedding itself is a miss.
     """
-    X = _trigram_encode(sequences)
+    seq_key = _sequence_key(sequences)
 
     if method == "tsne":
         perplexity = float(os.getenv("ACTIVITY_TSNE_PERPLEXITY", "15"))
         max_iter   = int(os.getenv("ACTIVITY_TSNE_MAX_ITER", "500"))
-        n_samples  = X.shape[0]
+        n_samples  = len(sequences)
         # sklearn requires perplexity < n_samples; clamp so small datasets work.
         perplexity = min(perplexity, max(1.0, n_samples - 1))
-        cache = _cache_path(sequences, "tsne", perplexity=perplexity, max_iter=max_iter)
-        if cache.exists():
-            return np.load(cache)
         try:
-            XY = TSNE(n_components=2, perplexity=perplexity,
-                      random_state=0, init="pca",
-                      learning_rate="auto", max_iter=max_iter).fit_transform(X)
-        except TypeError:
-            # sklearn < 1.4 used n_iter
-            XY = TSNE(n_components=2, perplexity=perplexity,
-                      random_state=0, init="pca",
-                      learning_rate="auto", n_iter=max_iter).fit_transform(X)
+            from openTSNE import TSNE as _OpenTSNE
+        except ImportError:
+            _OpenTSNE = None  # fall back to sklearn
+        backend = "opentsne" if _OpenTSNE is not None else "sklearn"
+        cache = _cache_path(seq_key, "tsne", perplexity=perplexity, max_iter=max_iter,
+                            backend=backend, svd=_TSNE_SVD_DIMS)
+        if cache.exists():
+            return _load_embedding(cache)
+        X_red = _tsne_input(_trigram_encode(sequences, seq_key))
+        if _OpenTSNE is not None:
+            # FFT-accelerated gradient, multi-threaded neighbour search
+            XY = np.asarray(_OpenTSNE(n_components=2, perplexity=perplexity,
+                                      n_iter=max_iter, initialization="pca",
+                                      negative_gradient_method="fft",
+                                      n_jobs=-1, random_state=0).fit(X_red))
+        else:
+            try:
+                XY = TSNE(n_components=2, perplexity=perplexity,
+                          random_state=0, init="pca", learning_rate="auto",
+                          max_iter=max_iter, method="barnes_hut", metric="euclidean",
+                          n_jobs=-1).fit_transform(X_red)
+            except TypeError:
+                # sklearn < 1.4 used n_iter
+                XY = TSNE(n_components=2, perplexity=perplexity,
+                          random_state=0, init="pca", learning_rate="auto",
+                          n_iter=max_iter, method="barnes_hut", metric="euclidean",
+                          n_jobs=-1).fit_transform(X_red)
         np.save(cache, XY)
         return XY
 
     if method == "umap":
         try:
             import umap as _umap
-            cache = _cache_path(sequences, "umap")
+            cache = _cache_path(seq_key, "umap")
             if cache.exists():
-                return np.load(cache)
+                return _load_embedding(cache)
+            X = _trigram_encode(sequences, seq_key)
             XY = _umap.UMAP(n_components=2, random_state=0).fit_transform(X.toarray())
             np.save(cache, XY)
             return XY
@@ -114,9 +204,10 @@ def _reduce_to_2d(sequences: list[str], method: str) -> np.ndarray:
             pass  # fall through to PCA
 
     # PCA — TruncatedSVD works directly on sparse matrix
-    cache = _cache_path(sequences, "pca")
+    cache = _cache_path(seq_key, "pca")
     if cache.exists():
-        return np.load(cache)
+        return _load_embedding(cache)
+    X = _trigram_encode(sequences, seq_key)
     XY = TruncatedSVD(n_components=2, random_state=0).fit_transform(X)
     np.save(cache, XY)
     return XY
@@ -126,6 +217,17 @@ def _reduce_to_2d(sequences: list[str], method: str) -> np.ndarray:
 # Surface interpolation
 # ---------------------------------------------------------------------------
 
+def _gaussian_weights(sigma: float, truncate: float = 4.0) -> np.ndarray:
+    """Normalised 1-D Gaussian taps, built as scipy.ndimage does for gaussian_filter."""
+    radius = int(truncate * sigma + 0.5)
+    x = np.arange(-radius, radius + 1)
+    w = np.exp(-0.5 / sigma ** 2 * x ** 2)
+    return w / w.sum()
+
+
+_SMOOTH_WEIGHTS = _gaussian_weights(1.5)
+
+
 def _surface(df: pd.DataFrame, x_col: str, y_col: str, z_col: str,
              grid_x: np.ndarray, grid_y: np.ndarray) -> np.ndarray:
     """
@@ -134,11 +236,18 @@ def _surface(df: pd.DataFrame, x_col: str, y_col: str, z_col: str,
     """
     points = np.column_stack([df[x_col].to_numpy(), df[y_col].to_numpy()])
     values = df[z_col].to_numpy()
-    z = griddata(points, values, (grid_x, grid_y), method="linear")
-    if np.isnan(z).any():
-        z_near = griddata(points, values, (grid_x, grid_y), method="nearest")
-        z = np.where(np.isnan(z), z_near, z)
-    return gaussian_filter(z, sigma=1.5)
+    # one Delaunay triangulation drives the linear pass; the KD-tree is only
+    # built when cells fall outside the hull, and only those cells are queried
+    z = LinearNDInterpolator(Delaunay(points), values)(grid_x, grid_y)
+    outside = np.isnan(z)
+    if outside.any():
+        _, nearest = cKDTree(points).query(np.column_stack([grid_x[outside], grid_y[outside]]))
+        z[outside] = values[nearest]
+    # separable Gaussian with precomputed taps — same result as
+    # gaussian_filter(sigma=1.5) without rebuilding the kernel per call
+    for axis in (0, 1):
+        z = correlate1d(z, _SMOOTH_WEIGHTS, axis=axis, mode="reflect")
+    return z
 
 
 # ---------------------------------------------------------------------------
@@ -211,26 +320,43 @@ def build_landscape_figure(
     g_x = np.linspace(data["x"].min(), data["x"].max(), _GRID_SIZE)
     g_y = np.linspace(data["y"].min(), data["y"].max(), _GRID_SIZE)
     grid_x, grid_y = np.meshgrid(g_x, g_y)
+    # plotted arrays are handed to Plotly as float32 ndarrays rather than
+    # Python lists: Plotly then emits compact typed-array (base64) JSON that
+    # plotly.js decodes directly, at half the bytes of float64
+    g_x32, g_y32 = g_x.astype(np.float32), g_y.astype(np.float32)
 
     # global colour bounds shared by all frames
     all_act  = data["activity_score"].to_numpy(dtype=float)
-    raw_min  = float(np.nanmin(all_act))
-    raw_max  = float(np.nanmax(all_act))
-    robust_lo = float(np.nanpercentile(all_act, 1))
-    robust_hi = float(np.nanpercentile(all_act, 99))
+    # one nanpercentile call partitions the data once for all four bounds;
+    # the 0th/100th percentiles are exactly the min/max
+    raw_min, robust_lo, robust_hi, raw_max = map(
+        float, np.nanpercentile(all_act, [0, 1, 99, 100])
+    )
 
-    gens    = sorted(data["generation"].unique())
+    # stable sort by generation so each cumulative (gen <= x) subset is a
+    # prefix — frames slice by position rather than re-masking every row
+    data = data.sort_values("generation", kind="stable", ignore_index=True)
+    gen_vals = data["generation"].to_numpy()
+    gens    = np.unique(gen_vals)  # sorted, in one C pass
+    gen_cuts = np.searchsorted(gen_vals, gens, side="right")
+    gen_labels = [int(g) if float(g).is_integer() else g for g in gens]
     z_modes = ["robust", "raw", "normalized"]
     frames: list[go.Frame] = []
 
+    # the surface depends only on a generation's cumulative points, not on
+    # the z-mode, so interpolate + smooth once per generation and let each
+    # mode re-transform the shared grid
+    gen_frames = [data.iloc[:cut] for cut in gen_cuts]
+    gen_surfaces = [
+        _surface(df_f, "x", "y", "activity_score", grid_x, grid_y)
+        for df_f in gen_frames
+    ]
+
     for mode in z_modes:
         m_min, m_max = _mode_range(mode, raw_min, raw_max, robust_lo, robust_hi)
-        for gen in gens:
-            df_f = data[data["generation"] <= gen]
-
+        for gen, df_f, z_gen in zip(gens, gen_frames, gen_surfaces):
             z_surf = _apply_mode(
-                _surface(df_f, "x", "y", "activity_score", grid_x, grid_y),
-                mode, raw_min, raw_max, robust_lo, robust_hi,
+                z_gen, mode, raw_min, raw_max, robust_lo, robust_hi,
             )
             z_scatter = _apply_mode(
                 df_f["activity_score"].to_numpy(dtype=float),
@@ -241,15 +367,15 @@ def build_landscape_figure(
                 name=_fname(mode, gen),
                 data=[
                     go.Surface(
-                        x=g_x.tolist(), y=g_y.tolist(), z=z_surf.tolist(),
+                        x=g_x32, y=g_y32, z=z_surf.astype(np.float32),
                         opacity=0.65, colorscale="Hot", showscale=True,
                         cmin=m_min, cmax=m_max,
                         colorbar=dict(title=_mode_axis_title(mode)),
                     ),
                     go.Scatter3d(
-                        x=df_f["x"].tolist(),
-                        y=df_f["y"].tolist(),
-                        z=z_scatter.tolist(),
+                        x=df_f["x"].to_numpy(np.float32),
+                        y=df_f["y"].to_numpy(np.float32),
+                        z=z_scatter.astype(np.float32),
                         customdata=np.column_stack([
                             df_f["variant_index"].to_numpy(),
                             df_f["generation"].to_numpy(),
@@ -276,8 +402,7 @@ def build_landscape_figure(
     # slider steps: all (mode × generation) combinations
     slider_steps: list[dict] = []
     for label, key in [("Robust", "robust"), ("Raw", "raw"), ("Norm", "normalized")]:
-        for gen in gens:
-            g_label = int(gen) if float(gen).is_integer() else gen
+        for gen, g_label in zip(gens, gen_labels):
             slider_steps.append(dict(
                 label=f"{label} G{g_label}",
                 method="animate",
@@ -6,7 +6,7 @@ circular plasmid DNA, then locks those coordinates for all variant extractions.
 
 from typing import Dict, List, Tuple, Optional
 import logging
-from services.sequence_tools import CODON_TABLE as GENETIC_CODE
+from services.sequence_tools import CODON_TABLE as GENETIC_CODE, translate_dna
 
 logger = logging.getLogger(__name__)
 
@@ -17,24 +17,12 @@ def _clean(seq: str) -> str:
 
 def _translate(dna_seq: str) -> str:
     """Translate DNA to protein, stopping at the first stop codon."""
-    protein = []
-    for i in range(0, len(dna_seq) - 2, 3):
-        codon = dna_seq[i:i+3]
-        aa = GENETIC_CODE.get(codon, 'X')
-        if aa == '*':
-            break
-        protein.append(aa)
-    return ''.join(protein)
+    return translate_dna(dna_seq, GENETIC_CODE).split('*', 1)[0]
 
 
 def _translate_full(dna_seq: str) -> str:
     """Translate DNA to protein including stop codons (as '*')."""
-    protein = []
-    for i in range(0, len(dna_seq) - 2, 3):
-        codon = dna_seq[i:i+3]
-        aa = GENETIC_CODE.get(codon, 'X')
-        protein.append(aa)
-    return ''.join(protein)
+    return translate_dna(dna_seq, GENETIC_CODE)
 
 
 def _reverse_complement(seq: str) -> str:
@@ -11,9 +11,12 @@ Includes:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
+from functools import cached_property
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional
 
-from .errors import FastaParseError, InvalidSequenceError
+import numpy as np
+
+from .errors import FastaParseError, FastaTooLargeError, InvalidSequenceError
 
 
 # =============================================================================
@@ -23,14 +26,28 @@ from .errors import FastaParseError, InvalidSequenceError
 def _parse_fasta(text: str) -> List[str]:
     # strips blank lines and header lines starting with '>' before building
     # sequences — handles FASTA files with inconsistent line endings
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    if not lines:
+    if not text.strip():
         raise FastaParseError("Empty FASTA input")
 
+    # hot cases: a single record — a raw pasted sequence with no '>' at all,
+    # or one leading header and no other '>'. strip and join the sequence
+    # lines in C, with no per-line Python work
+    if ">" not in text:
+        return ["".join(map(str.strip, text.splitlines()))]
+    if text[:1] == ">" and text.find(">", 1) == -1:
+        seq = "".join(map(str.strip, text.splitlines()[1:]))
+        if not seq:
+            raise FastaParseError("No sequences found in FASTA")
+        return [seq]
+
     sequences: List[str] = []
     current: List[str] = []
 
-    for line in lines:
+    # single pass: strip, skip blanks and flush records as headers are met
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
         if line.startswith(">"):
             # on a new header, flush the accumulated sequence before starting the next
             if current:
@@ -48,6 +65,73 @@ def _parse_fasta(text: str) -> List[str]:
     return sequences
 
 
+class FastaRecord(NamedTuple):
+    # a NamedTuple rather than a frozen dataclass: construction is a single C
+    # call and each record is a plain 2-tuple, which matters when streaming
+    header: str  # header line without the leading '>' ("" for headerless input)
+    seq: str
+
+
+def iter_fasta_records(
+    stream: BinaryIO,
+    *,
+    chunk_size: int = 65_536,
+    max_bytes: Optional[int] = None,
+) -> Iterator[FastaRecord]:
+    # streaming counterpart of _parse_fasta for file uploads: reads fixed-size
+    # chunks, carries the trailing partial line into the next chunk, and yields
+    # each record as soon as the following header (or EOF) closes it — so a
+    # caller can stop reading at the second record without buffering the file
+    header: Optional[str] = None
+    parts: List[bytes] = []
+    carry = b""
+    total = 0
+
+    def _flush() -> Optional[FastaRecord]:
+        if not parts:
+            return None
+        try:
+            # strict: a corrupted byte must fail, not silently shorten the sequence
+            seq = b"".join(parts).decode("ascii")
+        except UnicodeDecodeError:
+            raise FastaParseError("FASTA sequence contains non-ASCII bytes") from None
+        parts.clear()
+        return FastaRecord(header or "", seq)
+
+    while True:
+        chunk = stream.read(chunk_size)
+        total += len(chunk)
+        if max_bytes is not None and total > max_bytes:
+            raise FastaTooLargeError(f"FASTA input exceeds {max_bytes:,} bytes")
+        if not chunk:
+            lines = [carry]
+        else:
+            lines = (carry + chunk).split(b"\n")
+            carry = lines.pop()
+        for line in lines:
+            # lone '\r' line endings are split here; '\r\n' is handled by strip
+            for piece in line.split(b"\r"):
+                piece = piece.strip()
+                if not piece:
+                    continue
+                if piece.startswith(b">"):
+                    record = _flush()
+                    if record is not None:
+                        yield record
+                    try:
+                        header = piece[1:].decode("utf-8").strip()
+                    except UnicodeDecodeError:
+                        raise FastaParseError("FASTA header is not valid UTF-8") from None
+                else:
+                    parts.append(piece)
+        if not chunk:
+            break
+
+    record = _flush()
+    if record is not None:
+        yield record
+
+
 def parse_fasta_dna(text: str) -> str:
     sequences = _parse_fasta(text)
     # enforces single-record input — multi-record FASTA would be ambiguous
@@ -68,10 +152,21 @@ def parse_fasta_protein(text: str) -> str:
     return sequences[0].upper()
 
 
+# 'N' is included as a valid character — it represents an ambiguous base
+# commonly produced by sequencing when the instrument cannot confidently
+# call a nucleotide; rejecting N would fail many real sequencing outputs
+_VALID_DNA_BYTES = b"ACGTNacgtn"
+
+
 def validate_dna(seq: str) -> None:
-    # 'N' is included as a valid character — it represents an ambiguous base
-    # commonly produced by sequencing when the instrument cannot confidently
-    # call a nucleotide; rejecting N would fail many real sequencing outputs
+    # deleting every valid byte in one C-level pass leaves nothing behind for
+    # a clean sequence; the set of offending characters is only built when
+    # something is left over (or the input is not ASCII)
+    try:
+        if not seq.encode("ascii").translate(None, _VALID_DNA_BYTES):
+            return
+    except UnicodeEncodeError:
+        pass
     invalid = set(seq.upper()) - {"A", "C", "G", "T", "N"}
     if invalid:
         raise InvalidSequenceError(
@@ -105,27 +200,149 @@ CODON_TABLE: Dict[str, str] = {
 }
 
 
-def translate_dna(seq: str, codon_table: Dict[str, str]) -> str:
-    aa: List[str] = []
+# radix-5 digit per base for the vectorised translation: A/C/G/T -> 0..3 and
+# every other byte -> 4. a codon then indexes a 125-entry lookup table at
+# a*25 + b*5 + c, and any codon holding a non-ACGT base lands on an 'X' slot
+_BASES = "ACGT"
+_CODON_DIGIT = bytes(_BASES.find(chr(i)) % 5 for i in range(256))  # -1 % 5 == 4
+
+
+def _codon_lut(codon_table: Dict[str, str]) -> np.ndarray | None:
+    # None when the table cannot be expressed as a radix lookup (keys outside
+    # the 64 ACGT codons, or multi-character / non-ASCII values) — the caller
+    # then falls back to the per-codon dict loop
+    if any(len(k) != 3 or k.strip(_BASES) for k in codon_table):
+        return None
+    lut = np.full(125, b"X", dtype="S1")
+    for a, x in enumerate(_BASES):
+        for b, y in enumerate(_BASES):
+            for c, z in enumerate(_BASES):
+                aa = codon_table.get(x + y + z, "X")
+                if len(aa) != 1 or not aa.isascii():
+                    return None
+                lut[a * 25 + b * 5 + c] = aa.encode("ascii")
+    return lut
+
+
+_CODON_LUT = _codon_lut(CODON_TABLE)
+
+# two-codon table for the standard code: index c1 * 125 + c2 -> two amino
+# acids, so long sequences take half as many gathers (15,625 x 2 bytes)
+_DICODON_LUT = np.char.add(_CODON_LUT[:, None], _CODON_LUT[None, :]).ravel()
+
+# below this many codons the extra pairing arithmetic costs more than the
+# halved gather saves (~5 µs vs ~7 µs at 100 codons, 37 vs 51 µs at 6,700)
+_DICODON_MIN_CODONS = 1_000
+
+# complement of each codon digit (A<->T, C<->G; ambiguous stays ambiguous)
+_RC_DIGIT = np.array([3, 2, 1, 0, 4], dtype=np.uint8)
+
+
+def _translate_python(seq: str, codon_table: Dict[str, str]) -> str:
+    # bound once so the loop body is a local call, not an attribute lookup
+    get = codon_table.get
     # range stops at len - 2 to avoid reading a partial codon at the end of
-    # the sequence — a trailing 1 or 2 nucleotide remainder is silently ignored
-    for i in range(0, len(seq) - 2, 3):
-        codon = seq[i : i + 3]
-        # unknown codons (e.g. those containing 'N') are translated as 'X'
-        # rather than raising an error, consistent with standard bioinformatics convention
-        aa.append(codon_table.get(codon, "X"))
-    return "".join(aa)
+    # the sequence — a trailing 1 or 2 nucleotide remainder is silently ignored.
+    # unknown codons (e.g. those containing 'N') are translated as 'X'
+    # rather than raising an error, consistent with standard bioinformatics convention
+    return "".join([get(seq[i : i + 3], "X") for i in range(0, len(seq) - 2, 3)])
+
+
+def _encode_codon_digits(seq: str) -> np.ndarray:
+    # one C-level byte translate encodes the sequence; non-ASCII characters
+    # become '?' (one byte each, so positions are preserved) and map to 'X'
+    return np.frombuffer(
+        seq.encode("ascii", "replace").translate(_CODON_DIGIT), dtype=np.uint8
+    )
+
+
+@dataclass(frozen=True)
+class EncodedSeq:
+    # a DNA sequence carried together with its codon-digit encoding, so
+    # helpers further down the stack translate it without re-encoding
+    seq: str
+    digits: np.ndarray
+
+    @cached_property
+    def rc_digits(self) -> np.ndarray:
+        # reverse complement in digit space, built on first use and then kept
+        # for every later caller holding the same EncodedSeq
+        return _RC_DIGIT[self.digits[::-1]]
+
+
+def encode_seq(seq: str | EncodedSeq) -> EncodedSeq:
+    if isinstance(seq, EncodedSeq):
+        return seq
+    return EncodedSeq(seq, _encode_codon_digits(seq))
+
+
+def _translate_digits(digits: np.ndarray, lut: np.ndarray) -> str:
+    # a trailing 1 or 2 nucleotide remainder is silently ignored
+    codons = digits[: len(digits) // 3 * 3].reshape(-1, 3)
+    idx = codons[:, 0] * 25 + codons[:, 1] * 5 + codons[:, 2]
+    if lut is not _CODON_LUT or len(idx) < _DICODON_MIN_CODONS:
+        return lut[idx].tobytes().decode("ascii")
+
+    # standard code, long input: gather codon pairs, then the odd last codon
+    n_pairs = len(idx) // 2
+    pairs = idx[0 : 2 * n_pairs : 2].astype(np.uint16) * 125 + idx[1 : 2 * n_pairs : 2]
+    aa = _DICODON_LUT[pairs].tobytes()
+    if len(idx) % 2:
+        aa += lut[idx[-1:]].tobytes()
+    return aa.decode("ascii")
+
+
+# below this many nucleotides the fixed NumPy dispatch cost outweighs the
+# vectorised gather, so short un-encoded inputs take the dict loop instead
+# (90 nt: 5.5 vs 3.9 µs; 150 nt: 5.5 vs 6.2 µs; 600 nt: 7.1 vs 28 µs)
+NUMPY_TRANSLATE_MIN_NT = 120
+
+
+# the standard LUT as a str, for indexing from plain Python
+_CODON_LUT_STR = _CODON_LUT.tobytes().decode("ascii")
+
+
+def _translate_radix(seq: str) -> str:
+    # short-input path for the standard code: the same radix-5 digits as the
+    # NumPy path, indexed per codon from Python. ambiguous bases are already
+    # digit 4, so there is no per-base membership test and no codon slicing
+    d = seq.encode("ascii", "replace").translate(_CODON_DIGIT)
+    lut = _CODON_LUT_STR
+    return "".join([lut[d[i] * 25 + d[i + 1] * 5 + d[i + 2]] for i in range(0, len(d) - 2, 3)])
+
+
+def translate_dna(seq: str | EncodedSeq, codon_table: Dict[str, str]) -> str:
+    if isinstance(seq, str) and len(seq) < NUMPY_TRANSLATE_MIN_NT:
+        if codon_table is CODON_TABLE:
+            return _translate_radix(seq)
+        return _translate_python(seq, codon_table)
+    lut = _CODON_LUT if codon_table is CODON_TABLE else _codon_lut(codon_table)
+    if lut is None:
+        if isinstance(seq, EncodedSeq):
+            seq = seq.seq
+        return _translate_python(seq, codon_table)
+    return _translate_digits(encode_seq(seq).digits, lut)
+
+
+# complement lookup for str.translate: Watson-Crick pairs plus the IUPAC
+# ambiguity codes (R<->Y, K<->M, B<->V, D<->H; S, W, N are self-complementary);
+# any other Latin-1 character complements to 'N'
+_RC_TABLE: Dict[int, str] = {i: "N" for i in range(256)}
+_RC_TABLE.update(str.maketrans(
+    "ACGTRYSWKMBDHVNacgtryswkmbdhvn",
+    "TGCAYRSWMKVHDBNtgcayrswmkvhdbn",
+))
 
 
 def reverse_complement(seq: str) -> str:
-    # reads the sequence in reverse then maps each base to its Watson-Crick
-    # complement — required to search the antisense strand of a DNA molecule
-    complement = {"A": "T", "T": "A", "C": "G", "G": "C", "N": "N"}
-    return "".join(complement.get(b, "N") for b in reversed(seq))
+    # maps each base to its Watson-Crick complement, then reads the result in
+    # reverse — required to search the antisense strand of a DNA molecule.
+    # str.translate + slice keeps the whole pass in C
+    return seq.translate(_RC_TABLE)[::-1]
 
 
 def translate_six_frames(
-    seq: str,
+    seq: str | EncodedSeq,
     *,
     codon_table: Dict[str, str] | None = None,
 ) -> Dict[str, str]:
@@ -135,7 +352,23 @@ def translate_six_frames(
     if codon_table is None:
         codon_table = CODON_TABLE
 
-    frames: Dict[str, str] = {}
+    lut = _CODON_LUT if codon_table is CODON_TABLE else _codon_lut(codon_table)
+    if lut is not None:
+        # encode once and derive the antisense strand in digit space: A<->T and
+        # C<->G are 3 - d, and ambiguous bases (4) stay ambiguous. all six
+        # frames are then views into these two buffers over one shared LUT
+        enc = encode_seq(seq)
+        fwd, rev = enc.digits, enc.rc_digits
+        frames: Dict[str, str] = {}
+        for frame in range(3):
+            frames[f"+{frame}"] = _translate_digits(fwd[frame:], lut)
+        for frame in range(3):
+            frames[f"-{frame}"] = _translate_digits(rev[frame:], lut)
+        return frames
+
+    if isinstance(seq, EncodedSeq):
+        seq = seq.seq
+    frames = {}
 
     for frame in range(3):
         frames[f"+{frame}"] = translate_dna(seq[frame:], codon_table)
@@ -151,6 +384,40 @@ def translate_six_frames(
 # Smith–Waterman local alignment
 # =============================================================================
 
+# numba is optional — when available the DP recurrence runs as compiled code
+# over two rolling int32 rows; otherwise the pure-Python loop below is used
+_sw_kernel = None
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _sw_kernel(a, b, match, mismatch, gap):
+        n, m = a.shape[0], b.shape[0]
+        # only rows i-1 and i are ever read, so two buffers replace the full
+        # matrix; column 0 is never written and stays at the zero boundary
+        prev = np.zeros(m + 1, np.int32)
+        cur = np.zeros(m + 1, np.int32)
+        best, best_i, best_j = 0, 0, 0
+        for i in range(1, n + 1):
+            ai = a[i - 1]
+            for j in range(1, m + 1):
+                score = prev[j - 1] + (match if ai == b[j - 1] else mismatch)
+                score = max(score, prev[j] + gap, cur[j - 1] + gap, 0)
+                cur[j] = score
+                if score > best:
+                    best, best_i, best_j = score, i, j
+            prev, cur = cur, prev
+        return best, best_i, best_j
+except ImportError:
+    pass
+
+
+def _char_codes(seq: str) -> np.ndarray:
+    # one fixed-width code per character, so equality in the kernel is exactly
+    # str equality for any input (not just ASCII)
+    return np.frombuffer(seq.encode("utf-32-le"), dtype=np.uint32)
+
+
 @dataclass
 class AlignmentResult:
     score: int
@@ -168,28 +435,47 @@ def smith_waterman_local(
     max_cells: int = 2_000_000,
 ) -> AlignmentResult | None:
     n, m = len(a), len(b)
-    # local alignment is O(n*m) in both time and memory — for very long
-    # sequences (e.g. whole plasmids vs large proteins) this becomes prohibitive.
+    # local alignment is O(n*m) in time — for very long sequences
+    # (e.g. whole plasmids vs large proteins) this becomes prohibitive.
     # returning None signals to the caller that alignment was skipped
     if n * m > max_cells:
         return None
 
-    # H[i][j] stores the best local alignment score ending at position (i, j);
-    # initialised to zero so the alignment can start anywhere in either sequence
-    H = [[0] * (m + 1) for _ in range(n + 1)]
+    if _sw_kernel is not None:
+        score, end_i, end_j = _sw_kernel(
+            _char_codes(a), _char_codes(b), match, mismatch, gap
+        )
+        return AlignmentResult(int(score), int(end_i), int(end_j))
+
+    # row-at-a-time DP in NumPy: only row i-1 is needed to build row i, so
+    # memory is O(m) and the interpreter runs once per row rather than per cell
+    a_codes, b_codes = _char_codes(a), _char_codes(b)
+    # j * gap for each column — shifts the running maximum of the left moves
+    col_gap = np.arange(1, m + 1, dtype=np.int64) * gap
+    # both rows start at zero so the alignment can start anywhere in either
+    # sequence; column 0 is the zero boundary
+    prev = np.zeros(m + 1, dtype=np.int64)
+    cur = np.zeros(m + 1, dtype=np.int64)
 
     best = AlignmentResult(0, 0, 0)
 
     for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            score = max(
-                0,  # zero floor allows the alignment to restart — key property of local alignment
-                H[i - 1][j - 1] + (match if a[i - 1] == b[j - 1] else mismatch),
-                H[i - 1][j] + gap,   # gap in b
-                H[i][j - 1] + gap,   # gap in a
-            )
-            H[i][j] = score
-            if score > best.score:
-                best = AlignmentResult(score, i, j)
+        # diagonal and up moves only read the previous row; the zero floor
+        # allows the alignment to restart — key property of local alignment
+        step = np.maximum(
+            prev[:-1] + np.where(b_codes == a_codes[i - 1], match, mismatch),
+            prev[1:] + gap,  # gap in b
+        )
+        np.maximum(step, 0, out=step)
+        # gap in a chains along the row: cur[j] = max over k <= j of
+        # step[k] + (j - k) * gap, i.e. a running max of step[k] - k * gap
+        np.maximum.accumulate(step - col_gap, out=cur[1:])
+        cur[1:] += col_gap
+
+        # first maximal cell in row-major order, as in the cell-by-cell scan
+        j = int(cur.argmax())
+        if cur[j] > best.score:
+            best = AlignmentResult(int(cur[j]), i, j)
+        prev, cur = cur, prev
 
     return best
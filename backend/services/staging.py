@@ -3,10 +3,12 @@ Staging service: fetch UniProt data and validate plasmid encodes WT protein.
 """
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import asdict
 from typing import Any, Optional
 import hashlib
 import json
+import threading
 from pathlib import Path
 
 from .sequence_tools import parse_fasta_dna, parse_fasta_protein
@@ -20,6 +22,14 @@ from .uniprot_client import (
 
 DEFAULT_VALIDATION_CACHE = Path("instance") / "validation_cache"
 
+# In-process LRU in front of the disk cache: repeated POSTs of the same input
+# (common while tweaking the UI) skip the file read. Entries are kept as JSON
+# text and decoded on every hit, so each caller gets its own nested
+# validation/features objects and can't corrupt the cached result.
+_MEMORY_CACHE_SIZE = 32
+_memory_cache: OrderedDict[str, str] = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
 
 def _cache_key(accession: str, plasmid_fasta_text: str, fetch_features: bool) -> str:
     h = hashlib.sha1()
@@ -31,6 +41,27 @@ def _cache_key(accession: str, plasmid_fasta_text: str, fetch_features: bool) ->
     return h.hexdigest()
 
 
+def _memory_cache_get(key: str) -> Optional[dict[str, Any]]:
+    with _memory_cache_lock:
+        text = _memory_cache.get(key)
+        if text is None:
+            return None
+        _memory_cache.move_to_end(key)
+    return json.loads(text)
+
+
+def _memory_cache_put(key: str, data: dict[str, Any]) -> None:
+    try:
+        text = json.dumps(data)
+    except (TypeError, ValueError):
+        return
+    with _memory_cache_lock:
+        _memory_cache[key] = text
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
 def _cache_paths(cache_dir: Path, key: str) -> Path:
     return cache_dir / f"{key}.json"
 
@@ -46,6 +77,7 @@ def _read_validation_cache(cache_dir: Path, key: str) -> Optional[dict[str, Any]
 
 
 def _write_validation_cache(cache_dir: Path, key: str, data: dict[str, Any]) -> None:
+    _memory_cache_put(key, data)
     try:
         cache_dir.mkdir(parents=True, exist_ok=True)
         path = _cache_paths(cache_dir, key)
@@ -76,8 +108,12 @@ def stage_experiment_validate_plasmid(
 
     # Optional cache for repeat demo runs or repeated inputs.
     cache_key = _cache_key(accession, plasmid_fasta_text, fetch_features)
+    cached = _memory_cache_get(cache_key)
+    if cached is not None:
+        return cached
     cached = _read_validation_cache(DEFAULT_VALIDATION_CACHE, cache_key)
     if cached is not None:
+        _memory_cache_put(cache_key, cached)
         return cached
 
     try:
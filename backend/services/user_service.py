@@ -56,7 +56,11 @@ class UserService:
     def verify_user(self, email: str, password: str) -> Optional[User]:
         """Verify user credentials"""
         user = self.get_user_by_email(email)
-        if user and User.verify_password(password, user.password_hash):
+        if user is None:
+            # Same bcrypt cost as a real check — see User.dummy_password_hash
+            User.verify_password(password, User.dummy_password_hash())
+            return None
+        if User.verify_password(password, user.password_hash):
             return user
         return None
 
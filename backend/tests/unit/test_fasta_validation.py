@@ -1,7 +1,9 @@
+import io
+
 import pytest
 
-from services.sequence_tools import parse_fasta_dna, parse_fasta_protein
-from services.errors import FastaParseError, InvalidSequenceError
+from services.sequence_tools import iter_fasta_records, parse_fasta_dna, parse_fasta_protein
+from services.errors import FastaParseError, FastaTooLargeError, InvalidSequenceError
 
 
 def test_multi_record_dna_fasta_rejected_by_default():
@@ -30,3 +32,35 @@ ACDEFG
 """
     with pytest.raises(FastaParseError):
         parse_fasta_protein(fasta)
+
+
+def test_mixed_line_endings_and_blank_lines_joined():
+    fasta = ">plasmid\r\nACGT  \r\n\r\n  ACGT\rAC\n"
+    assert parse_fasta_dna(fasta) == "ACGTACGTAC"
+
+
+def test_header_only_fasta_rejected():
+    with pytest.raises(FastaParseError):
+        parse_fasta_dna(">plasmid\n\n")
+
+
+def test_streamed_records_split_across_chunks():
+    stream = io.BytesIO(b">p1 first\r\nACGT\r\nAC\n\n>p2\nGGG")
+    records = list(iter_fasta_records(stream, chunk_size=3))
+    assert [(r.header, r.seq) for r in records] == [("p1 first", "ACGTAC"), ("p2", "GGG")]
+
+
+def test_streamed_input_over_limit_rejected():
+    stream = io.BytesIO(b">p\n" + b"A" * 100)
+    with pytest.raises(FastaTooLargeError):
+        list(iter_fasta_records(stream, chunk_size=16, max_bytes=50))
+
+
+def test_streamed_non_ascii_sequence_rejected():
+    stream = io.BytesIO(b">p\nACG\xc3\xa9T\n")
+    with pytest.raises(FastaParseError, match="non-ASCII"):
+        list(iter_fasta_records(stream))
+
+
+def test_raw_sequence_without_header_accepted():
+    assert parse_fasta_dna("  acgt\nACGT\r\n") == "ACGTACGT"
@@ -9,6 +9,7 @@ import pytest
 from services.sequence_tools import (
     AlignmentResult,
     CODON_TABLE,
+    encode_seq,
     parse_fasta_dna,
     parse_fasta_protein,
     reverse_complement,
@@ -116,6 +117,19 @@ class TestTranslateDna:
         # ATG + AT (only 2 nt trailing) → only M
         assert translate_dna("ATGAT", CODON_TABLE) == "M"
 
+    def test_ambiguous_base_in_any_position_returns_x(self):
+        assert translate_dna("ATGNTGATNAAAatg", CODON_TABLE) == "MXXKX"
+
+    def test_long_sequence_matches_short_path(self):
+        # long inputs take the vectorised path; results must not depend on it
+        seq = "ATGTTTNNNTAAGGCatg" * 40
+        expected = "".join(translate_dna(seq[i : i + 18], CODON_TABLE) for i in range(0, len(seq), 18))
+        assert translate_dna(seq, CODON_TABLE) == expected
+
+    def test_custom_codon_table(self):
+        table = dict(CODON_TABLE, TGA="W")
+        assert translate_dna("ATGTGA", table) == "MW"
+
 
 # ---------------------------------------------------------------------------
 # reverse_complement
@@ -135,6 +149,12 @@ class TestReverseComplement:
     def test_empty(self):
         assert reverse_complement("") == ""
 
+    def test_iupac_and_lowercase(self):
+        assert reverse_complement("RYKMacgt") == "acgtKMRY"
+
+    def test_unknown_character_complements_to_n(self):
+        assert reverse_complement("AZ") == "NT"
+
 
 # ---------------------------------------------------------------------------
 # translate_six_frames
@@ -154,6 +174,19 @@ class TestTranslateSixFrames:
         frames = translate_six_frames("ATGCATGCAT")
         assert all(isinstance(v, str) for v in frames.values())
 
+    def test_encoded_input_matches_str_input(self):
+        seq = "ATGNCATRGCATTAGCc"
+        enc = encode_seq(seq)
+        assert translate_six_frames(enc) == translate_six_frames(seq)
+        assert translate_dna(enc, CODON_TABLE) == translate_dna(seq, CODON_TABLE)
+
+    def test_minus_frames_match_reverse_complement(self):
+        seq = "ATGNCATRGCATTAGCc"
+        frames = translate_six_frames(seq)
+        rc = reverse_complement(seq)
+        for frame in range(3):
+            assert frames[f"-{frame}"] == translate_dna(rc[frame:], CODON_TABLE)
+
 
 # ---------------------------------------------------------------------------
 # smith_waterman_local
@@ -182,6 +215,9 @@ class TestSmithWatermanLocal:
         result = smith_waterman_local(big_a, big_b)
         assert result is None
 
+    def test_end_coordinates_of_best_cell(self):
+        assert smith_waterman_local("ACGT", "ACGT") == AlignmentResult(8, 4, 4)
+
     def test_partial_match(self):
         result = smith_waterman_local("XXXACGTXXX", "ACGT")
         assert result is not None
@@ -49,3 +49,29 @@ def test_staging_api_missing_fields():
 
     resp = client.post("/staging/api/staging", json={"accession": ""})
     assert resp.status_code == 400
+
+
+def test_staging_api_batch_accessions(monkeypatch):
+    def fake_stage(accession: str, plasmid_fasta_text: str, fetch_features: bool = True):
+        return {"accession": accession, "validation": {"is_valid": True}, "error": None}
+
+    monkeypatch.setattr(staging_routes, "stage_experiment_validate_plasmid", fake_stage)
+
+    client = _make_app().test_client()
+
+    resp = client.post(
+        "/staging/api/staging",
+        json={"accession": ["O34996", " P00001 ", "Q99999"], "plasmid_fasta": ">p\nAAA"},
+    )
+    assert resp.status_code == 200
+    assert [r["accession"] for r in resp.get_json()] == ["O34996", "P00001", "Q99999"]
+
+
+def test_staging_api_batch_with_blank_accession_rejected():
+    client = _make_app().test_client()
+
+    resp = client.post(
+        "/staging/api/staging",
+        json={"accession": ["O34996", ""], "plasmid_fasta": ">p\nAAA"},
+    )
+    assert resp.status_code == 400
@@ -31,3 +31,30 @@ def test_staging_handles_uniprot_error(monkeypatch):
 
     assert result["validation"] is None
     assert result["error"] is not None
+
+
+def test_staging_repeat_call_served_from_memory_cache(monkeypatch, tmp_path):
+    import services.staging as staging
+
+    calls = []
+
+    def fake_fetch_uniprot_fasta(accession: str, timeout_s: float = 10.0) -> str:
+        calls.append(accession)
+        return ">x\nMK"
+
+    monkeypatch.setattr(staging, "DEFAULT_VALIDATION_CACHE", tmp_path)
+    monkeypatch.setattr(staging, "fetch_uniprot_fasta", fake_fetch_uniprot_fasta)
+
+    plasmid = ">p\nATGAAATAA"
+    first = stage_experiment_validate_plasmid("MEMCACHE1", plasmid, fetch_features=False)
+    first["error"] = "mutated by caller"
+    first["validation"]["is_valid"] = "mutated by caller"
+    for path in tmp_path.iterdir():
+        path.unlink()  # a disk hit is no longer possible
+
+    second = stage_experiment_validate_plasmid("MEMCACHE1", plasmid, fetch_features=False)
+
+    assert calls == ["MEMCACHE1"]
+    assert second["wt_protein"] == "MK"
+    assert second["error"] != "mutated by caller"
+    assert second["validation"]["is_valid"] != "mutated by caller"
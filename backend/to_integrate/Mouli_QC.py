@@ -1,9 +1,13 @@
 # %%
+import os
+import sys
+import numpy as np
 import pandas as pd # Updated data parser, both exist in folder
 from datetime import datetime
+from functools import lru_cache
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy import Column, Integer, Float, String, Boolean, ForeignKey
@@ -11,9 +15,20 @@ from sqlalchemy import Column, Integer, Float, String, Boolean, ForeignKey
 # %%
 # SQLite database file (local)
 DB_FILE = "samples.db"
-engine = create_engine(f"sqlite:///{DB_FILE}", echo=True)
-
-Session = sessionmaker(bind=engine)
+# Statement logging formats every INSERT; opt in with SQL_ECHO=1 when debugging
+engine = create_engine(f"sqlite:///{DB_FILE}", echo=os.getenv("SQL_ECHO") == "1")
+
+@event.listens_for(engine, "connect")
+def _sqlite_bulk_pragmas(dbapi_connection, connection_record):
+    # Ingest is a one-shot bulk load, so trade crash durability for speed
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    cursor.close()
+
+Session = scoped_session(sessionmaker(bind=engine)) # One session per thread, reused by every caller
 session = Session()
 
 # %%
@@ -31,7 +46,7 @@ class Sample(Base):
     protein_quantification_pg = Column(Float, nullable=False)
     is_control = Column(Boolean, nullable=False)
 
-    sample.extra_data = relationship("SampleMetadata", back_populates="sample", cascade="all, delete-orphan") #5_change
+    extra_data = relationship("SampleMetadata", back_populates="sample", cascade="all, delete-orphan") #5_change
 
 
 class SampleMetadata(Base):
@@ -59,6 +74,9 @@ essential_fields = {
     "is_control": bool
 }
 
+ESSENTIAL_TUPLE = tuple(essential_fields) # Fixed column order for selection/iteration
+ESSENTIAL_SET = frozenset(essential_fields)
+
 col_synonyms = {
     "plasmid_variant_index": ["variant_index", "plasmid_id"],
     "parent_plasmid_variant": ["parent_variant", "parent_id"],
@@ -70,16 +88,21 @@ col_synonyms = {
 }
 
 # %%
+_CLEAN_TABLE = str.maketrans({" ": "_", "-": "_"})
+
+@lru_cache(maxsize=1024) # Column names repeat across files
 def clean_cols(col: str) -> str:
-    return col.strip().lower().replace(" ", "_").replace("-", "_")
+    return col.strip().lower().translate(_CLEAN_TABLE)
 
 def build_synonym_map(col_synonyms): #Reverse synonym lookup
     synonym_map = {}
     for synonym, variants in col_synonyms.items():
-        for v in variants:
+        for v in [synonym, *variants]: # Canonical names resolve directly too
             synonym_map[clean_cols(v)] = synonym
     return synonym_map
 
+SYNONYM_MAP = build_synonym_map(col_synonyms) # Built once at import
+
 def validate_mapping(mapping): #Prevents uplicate assignments. Remove if confirmation can be require in fronten. 
     reverse = {}
     for raw, field in mapping.items():
@@ -125,22 +148,20 @@ def confirm_mapping_bulk(mapping):
 
 # %%
 class ColumnMapper:
-    def __init__(self, essential_fields, col_synonyms):
+    def __init__(self, essential_fields, col_synonyms=None):
         self.essential_fields = list(essential_fields.keys())
-        self.synonym_map = build_synonym_map(col_synonyms)
+        # Default schema reuses the import-time map; custom synonyms get their own
+        self.synonym_map = SYNONYM_MAP if col_synonyms is None else build_synonym_map(col_synonyms)
 
     def auto_map_by_synonym(self, columns):
-        mapping = {}
-        used_cols = set()
-
+        # One dict pass; the first column to claim a field keeps it (avoids duplicates)
+        claimed = {}
         for col in columns:
-            if col in self.synonym_map:
-                official = self.synonym_map[col]
-                if official not in mapping.values():  # avoid duplicates
-                    mapping[col] = official
-                    used_cols.add(col)
+            claimed.setdefault(self.synonym_map.get(col), col)
+        claimed.pop(None, None)
 
-        return mapping, used_cols
+        mapping = {col: official for official, col in claimed.items()}
+        return mapping, set(mapping)
 
     def left_to_right_assign(self, columns, used_cols, existing_mapping): #If NOT already mapped
 
@@ -153,7 +174,7 @@ class ColumnMapper:
 
         return existing_mapping
 
-    def generate_mapping(self, df_columns):
+    def generate_mapping(self, df_columns, interactive=False):
         # Track original ↔ cleaned names
         original_to_clean = {c: clean_cols(c) for c in df_columns}
         clean_to_original = {v: k for k, v in original_to_clean.items()}
@@ -163,8 +184,9 @@ class ColumnMapper:
         #Synonym mapping
         mapping, used = self.auto_map_by_synonym(cleaned_cols)
 
-        #Left-to-right
-        mapping = self.left_to_right_assign(cleaned_cols, used, mapping)
+        #Left-to-right, only needed when synonyms left fields unresolved
+        if len(mapping) < len(self.essential_fields):
+            mapping = self.left_to_right_assign(cleaned_cols, used, mapping)
 
         #Validate before user sees it
         validate_mapping(mapping)
@@ -176,102 +198,108 @@ class ColumnMapper:
             print("\nMissing essential fields (not found in file):", missing_fields)
 
 
-        #User confirmation - do in front en later?
-        mapping = confirm_mapping_bulk(mapping)
+        #User confirmation - do in front en later? Opt in with --interactive
+        if interactive:
+            mapping = confirm_mapping_bulk(mapping)
 
         # Convert cleaned names back to original DataFrame column names
         final_mapping = {clean_to_original[k]: v for k, v in mapping.items()}
         return final_mapping
 
 # %%
-def validate_row(row):
-    errors = []
-
-    # Missing essential fields
-    for field in essential_fields:
-        if pd.isna(row.get(field)):
-            errors.append(f"Missing value for {field}")
-
-    # Biological / logical rules
-    if row.get("directed_evolution_generation", 0) < 0:
-        errors.append("Generation cannot be negative")
-    if row.get("dna_quantification_fg", 0) < 0:
-        errors.append("DNA quantification cannot be negative")
-    if row.get("protein_quantification_pg", 0) < 0:
-        errors.append("Protein quantification cannot be negative")
-    if row.get("is_control") not in [True, False]:
-        errors.append("is_control must be boolean")
-
-    return errors
-
-
-# %%
-def insert_sql(df_valid):
-    metadata_columns = [c for c in df_valid.columns if c not in essential_fields]
-
-    for _, row in df_valid.iterrows():
-        sample = Sample(
-            plasmid_variant_index=row["plasmid_variant_index"],
-            parent_plasmid_variant=row["parent_plasmid_variant"],
-            directed_evolution_generation=row["directed_evolution_generation"],
-            assembled_dna_sequence=row["assembled_dna_sequence"],
-            dna_quantification_fg=row["dna_quantification_fg"],
-            protein_quantification_pg=row["protein_quantification_pg"],
-            is_control=row["is_control"]
-        )
-
-        for col in metadata_columns:
-            val = row[col]
-            if pd.notna(val):
-                sample.metadata.append(SampleMetadata(key=col, value=str(val)))
+try:
+    from pyarrow import json as pa_json # Multithreaded C++ readers
+    _CSV_ENGINE = "pyarrow"
+except ImportError:
+    pa_json = None
+    _CSV_ENGINE = "c"
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-        session.add(sample)
-    session.commit()
-
-
-# %%
 class FileLoader:
     def load(self, filepath) -> pd.DataFrame:
         if filepath.endswith(".tsv"):
-            return pd.read_csv(filepath, sep="\t")
+            return self._load_tsv(filepath)
         elif filepath.endswith(".json"):
-            return pd.read_json(filepath)
+            return self._load_json(filepath)
+        elif filepath.endswith(".jsonl"):
+            return self._load_jsonl(filepath)
         else:
             raise ValueError("Unsupported format")
 
+    def _load_tsv(self, filepath) -> pd.DataFrame:
+        # Sniff the header first so columns resolving to str fields (the DNA
+        # sequence) are read as strings without type inference. Numeric
+        # fields stay inferred: coerce_types turns bad values into NaN for QC,
+        # whereas an explicit float dtype here would abort the whole read.
+        header = pd.read_csv(filepath, sep="\t", nrows=0).columns
+        dtype = {
+            c: str for c in header
+            if essential_fields.get(SYNONYM_MAP.get(clean_cols(c), clean_cols(c))) is str
+        }
+        return pd.read_csv(filepath, sep="\t", dtype=dtype, engine=_CSV_ENGINE)
+
+    def _load_json(self, filepath) -> pd.DataFrame:
+        # orjson parses straight from bytes in C; pd.read_json is the fallback
+        if orjson is None:
+            return pd.read_json(filepath)
+        with open(filepath, "rb") as fh:
+            return pd.DataFrame(orjson.loads(fh.read()))
+
+    def _load_jsonl(self, filepath) -> pd.DataFrame:
+        # pyarrow's JSON reader only handles newline-delimited records
+        if pa_json is None:
+            return pd.read_json(filepath, lines=True)
+        return pa_json.read_json(filepath).to_pandas()
+
 
 # %%
+# Bool coercion map, applied after strip/lower-casing the raw values
+_BOOL_MAP = {
+    "1": True, "0": False,
+    "1.0": True, "0.0": False,
+    "true": True, "false": False,
+}
+
 def coerce_types(df, essential_fields):
 
-# 5_change Detect duplicate rows across all columns
-duplicates = df[df.duplicated(keep=False)]
+    # 5_change Detect duplicate rows across all columns
+    duplicates = df[df.duplicated(keep=False)]
 
-if not duplicates.empty:
-    print("\nDuplicate rows detected:")
+    if not duplicates.empty:
+        print("\nDuplicate rows detected:")
 
-    for idx in duplicates.index:
-        print(f"Row {idx+1} is duplicated")
+        for idx in duplicates.index:
+            print(f"Row {idx+1} is duplicated")
 
-    raise ValueError(
-        "Duplicate rows detected in input file. "
-        "Remove duplicates before ingestion."
-    )
+        raise ValueError(
+            "Duplicate rows detected in input file. "
+            "Remove duplicates before ingestion."
+        )
 
-    
-    df = df.copy()
+    # Columns are replaced in place rather than copying the whole frame
+    # first — callers pass the frame in and take it back (df = coerce_types(df, ...))
     for col, dtype in essential_fields.items():
         if col not in df.columns:
             continue
 
-        if dtype in [float, int]:
+        if dtype == float:
+            # Stays float64: this frame is what insert_sql writes, and float32
+            # would store 0.1 as 0.10000000149 (and flush tiny negatives to
+            # -0.0, slipping past the sign checks)
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
+        elif dtype == int:
+            df[col] = pd.to_numeric(df[col], errors="coerce", downcast="integer")
+
         elif dtype == bool:
-            df[col] = df[col].map(
-                {1: True, 0: False, "1": True, "0": False,
-                 "true": True, "false": False,
-                 "True": True, "False": False}
-            )
+            if df[col].dtype != bool:
+                # Normalise once with vectorised string ops, then a single map
+                normalised = df[col].astype("string").str.strip().str.lower()
+                df[col] = normalised.map(_BOOL_MAP).astype("boolean")
 
         elif dtype == str:
             df[col] = df[col].astype(str)
@@ -279,61 +307,118 @@ if not duplicates.empty:
     return df
 
 # %%
-def validate_row(row):
-    errors = []
-
-    # Missing essential values
-    for field in essential_fields:
-        if pd.isna(row.get(field)):
-            errors.append(f"Missing value for {field}")
-
-    # Logical rules
-    if pd.notna(row.get("directed_evolution_generation")) and row["directed_evolution_generation"] < 0:
-        errors.append("Generation cannot be negative")
-
-    if pd.notna(row.get("dna_quantification_fg")) and row["dna_quantification_fg"] < 0:
-        errors.append("DNA quantification cannot be negative")
-
-    if pd.notna(row.get("protein_quantification_pg")) and row["protein_quantification_pg"] < 0:
-        errors.append("Protein quantification cannot be negative")
-
-    if row.get("is_control") not in [True, False]:
-        errors.append("is_control must be boolean")
-
-    seq = row.get("assembled_dna_sequence")
-    if isinstance(seq, str) and not set(seq.upper()).issubset(set("ATCGNRYZ")):
-        errors.append("DNA sequence contains invalid characters")
-
-    return errors
+# Byte lookup table for the allowed DNA alphabet (either case)
+_DNA_LUT = np.zeros(256, dtype=bool)
+_DNA_LUT[np.frombuffer(b"ATCGNRYZatcgnryz", dtype=np.uint8)] = True
+
+def invalid_dna_mask(seqs):
+    """True where a sequence has a character outside the DNA alphabet; NaN counts as valid."""
+    present = seqs.notna().to_numpy()
+    strs = seqs[present].astype(str)
+
+    # One flat byte buffer for every sequence; latin-1 keeps one byte per
+    # character and turns anything wider into '?', which the LUT rejects
+    buf = np.frombuffer("".join(strs).encode("latin-1", errors="replace"), dtype=np.uint8)
+    bad = ~_DNA_LUT[buf]
+
+    mask = np.zeros(len(seqs), dtype=bool)
+    # Clean files are the common case: a single scan of the whole buffer
+    # settles it without attributing bad bytes back to their sequences
+    if not bad.any():
+        return pd.Series(mask, index=seqs.index)
+
+    bad_prefix = np.concatenate(([0], np.cumsum(bad)))
+    lengths = strs.str.len().to_numpy()
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    mask[present] = (bad_prefix[ends] - bad_prefix[starts]) > 0
+    return pd.Series(mask, index=seqs.index)
+
+def validate_frame(df):
+    """Whole-frame QC: one '; '-joined error string per row, '' if the row is clean."""
+    checks = [(df[field].isna(), f"Missing value for {field}") for field in ESSENTIAL_TUPLE]
+
+    # Logical rules (NaN compares False, so missing values are only reported once)
+    checks += [
+        (df["directed_evolution_generation"] < 0, "Generation cannot be negative"),
+        (df["dna_quantification_fg"] < 0, "DNA quantification cannot be negative"),
+        (df["protein_quantification_pg"] < 0, "Protein quantification cannot be negative"),
+        (~df["is_control"].isin([True, False]), "is_control must be boolean"),
+        (invalid_dna_mask(df["assembled_dna_sequence"]), "DNA sequence contains invalid characters"),
+    ]
+
+    reasons = np.full(len(df), "", dtype=object)
+    for mask, message in checks:
+        reasons = np.where(mask.to_numpy(), reasons + (message + "; "), reasons)
+
+    return pd.Series(reasons, index=df.index).str.removesuffix("; ")
 
 # %%
-def insert_sql(valid_data):
-    session = Session()
-
-    metadata_columns = [c for c in valid_data.columns if c not in essential_fields]
-
-    for _, row in valid_data.iterrows():
-        sample = Sample(
-            plasmid_variant_index=row["plasmid_variant_index"],
-            parent_plasmid_variant=row["parent_plasmid_variant"],
-            directed_evolution_generation=row["directed_evolution_generation"],
-            assembled_dna_sequence=row["assembled_dna_sequence"],
-            dna_quantification_fg=row["dna_quantification_fg"],
-            protein_quantification_pg=row["protein_quantification_pg"],
-            is_control=row["is_control"]
+INSERT_CHUNK_SIZE = 10_000  # rows per executemany batch
+SQLITE_MAX_VARIABLES = 32_766  # bound parameters per statement (SQLite >= 3.32)
+
+# Built once and reused for every chunk. Every call writes freshly allocated
+# sample ids, so a plain INSERT can't collide with rows already stored
+_METADATA_INSERT = SampleMetadata.__table__.insert()
+
+def insert_sql(valid_data, metadata_columns=None):
+    if metadata_columns is None:
+        metadata_columns = [c for c in valid_data.columns if c not in ESSENTIAL_SET]
+
+    if valid_data.empty:
+        return
+
+    samples = valid_data[list(ESSENTIAL_TUPLE)]  # new frame; safe to extend in place
+
+    # One transaction for the whole file so the commit cost is paid once
+    with engine.begin() as conn:
+        # Take SQLite's write lock before reading max(id): a deferred BEGIN
+        # only holds a SHARED lock for the SELECT, so two writers could pick
+        # the same range. pysqlite sees the open transaction and won't issue
+        # its own BEGIN; engine.begin() still commits it.
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        # Assign ids up front so metadata rows can point at their sample
+        # without RETURNING or a re-query
+        first_id = conn.execute(select(func.coalesce(func.max(Sample.id), 0))).scalar() + 1
+        sample_ids = np.arange(first_id, first_id + len(samples))
+
+        # Multi-row VALUES inserts, sized to SQLite's bound-parameter limit
+        samples.insert(0, "id", sample_ids)
+        samples.to_sql(
+            Sample.__tablename__,
+            conn,
+            if_exists="append",
+            index=False,
+            method="multi",
+            chunksize=SQLITE_MAX_VARIABLES // (len(ESSENTIAL_TUPLE) + 1),
         )
 
-        # Store non-essential columns in metadata table
-        for col in metadata_columns:
-            val = row[col]
-            if pd.notna(val):
-                meta_entry = SampleMetadata(key=col, value=str(val))
-                sample.metadata.append(meta_entry)
+        # Long format: one (sample_id, key, value) row per non-null metadata cell
+        meta = (
+            valid_data[metadata_columns]
+            .assign(sample_id=sample_ids)
+            .melt(id_vars="sample_id", var_name="key", value_name="value")
+            .dropna(subset=["value"])
+        )
+        meta["value"] = meta["value"].astype(str)
+        meta_records = meta.to_dict(orient="records")
+        for start in range(0, len(meta_records), INSERT_CHUNK_SIZE):
+            conn.execute(_METADATA_INSERT, meta_records[start:start + INSERT_CHUNK_SIZE])
+
+# %%
+PARQUET_FILE = "samples.parquet"
 
-        session.add(sample)
+def stage_parquet(df_valid, path=PARQUET_FILE):
+    # Columnar copy of the QC'd rows for analytics; SQLite stays the
+    # transactional store. Optional — skipped if pyarrow isn't installed.
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("pyarrow not installed — skipping Parquet staging.")
+        return None
 
-    session.commit()
-    session.close()
+    df_valid.to_parquet(path, engine="pyarrow", compression="zstd", row_group_size=50_000, index=False)
+    return path
 
 # %% [markdown]
 # ### Pipeline
@@ -350,8 +435,8 @@ if df.empty: #5_change
         "Provide at least one experimental record."
     )
 
-mapper = ColumnMapper(essential_fields, col_synonyms)
-column_mapping = mapper.generate_mapping(df.columns)
+mapper = ColumnMapper(essential_fields)
+column_mapping = mapper.generate_mapping(df.columns, interactive="--interactive" in sys.argv)
 df = df.rename(columns=column_mapping)
 
 
@@ -363,41 +448,36 @@ if missing_fields:
         "Can not continue until these columns are present."
     )
 
-df = coerce_types(df, essential_fields)
-
-valid_rows, rejected_rows = [], []
-
-for idx, row in df.iterrows():
-    errs = validate_row(row)
-    if errs:
-        row["qc_error_reason"] = "; ".join(errs)
-        row["qc_row_number"] = idx + 1  # Human-readable row number
-        rejected_rows.append(row)
-    else:
-        valid_rows.append(row)
+# Column layout is fixed from here on, so the metadata split is computed once
+metadata_columns = [c for c in df.columns if c not in ESSENTIAL_SET]
 
-df_valid = pd.DataFrame(valid_rows)
-df_rejected = pd.DataFrame(rejected_rows)
+df = coerce_types(df, essential_fields)
 
+qc_errors = validate_frame(df)
+bad_mask = qc_errors != ""
+n_rejected = int(bad_mask.sum())
 
 print(f"\nQC Report:")
-print(f"Valid rows: {len(df_valid)}")
-print(f"Rejected rows: {len(df_rejected)}")
+print(f"Valid rows: {len(df) - n_rejected}")
+print(f"Rejected rows: {n_rejected}")
+
+if n_rejected > 0:
+    # Only materialise the rejected slice when there is something to report
+    df_rejected = df.loc[bad_mask].assign(
+        qc_error_reason=qc_errors[bad_mask],
+        qc_row_number=lambda d: d.index + 1,  # Human-readable row number
+    )
 
-if len(df_rejected) > 0:
     print("\n Rejected Row Summary:")
-    for _, r in df_rejected.iterrows():
-        print(f"Row {r['qc_row_number']}: {r['qc_error_reason']}")
+    for r in df_rejected[["qc_row_number", "qc_error_reason"]].itertuples(index=False):
+        print(f"Row {r.qc_row_number}: {r.qc_error_reason}")
 
     raise ValueError(" QC Failed — Fix and reupload file.")
 
 input("\n QC complete. Press Enter to continue.")
 
-
-insert_sql(df_valid)
-
-
-
-
-
-
+# Any rejection aborts above, so every row passed QC — hand the coerced
+# frame straight to the loaders instead of slicing out a copy
+df_valid = df
+insert_sql(df_valid, metadata_columns)
+stage_parquet(df_valid)
@@ -1,14 +1,10 @@
 import sqlite3
 import os
+import atexit
 import hashlib
+from contextlib import contextmanager
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from scipy.interpolate import griddata
-from scipy.ndimage import gaussian_filter
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.manifold import TSNE
-from sklearn.decomposition import TruncatedSVD
 
 # ── noise floor constants ──────────────────────────────────────────────────────
 
@@ -33,6 +29,20 @@ REQUIRED_INPUT_COLUMNS = {
         'Protein_Sequence'
 }
 
+# columns read from the input table: the required set plus the variant
+# identifier shown in the landscape hover text, when the table has it
+INPUT_COLUMNS = REQUIRED_INPUT_COLUMNS | {'Plasmid_Variant_Index'}
+
+# rows fetched per batch when reading the input table
+INPUT_CHUNK_ROWS = 50_000
+
+# measurements are read straight into float64 so the later to_numeric
+# coercion has nothing left to convert
+INPUT_DTYPES = {
+        'DNA_Quantification_fg': 'float64',
+        'Protein_Quantification_pg': 'float64',
+}
+
 
 def _existing_candidate_paths(relative_path):
         """
@@ -48,15 +58,11 @@ def _existing_candidate_paths(relative_path):
                 os.path.join(cwd, 'Desktop', 'Directed-Evolution-Portal', relative_path),
                 os.path.join(script_dir, '..', 'Directed-Evolution-Portal', relative_path),
         ]
-        # deduplicate while preserving order — os.path.abspath can produce
-        # the same resolved path from different relative expressions
-        seen = set()
-        ordered = []
-        for p in [os.path.abspath(p) for p in candidates]:
-                if p not in seen:
-                        seen.add(p)
-                        ordered.append(p)
-        return ordered
+        # every candidate is already rooted at cwd or script_dir, so normpath
+        # resolves it without another getcwd(); dict.fromkeys then deduplicates
+        # while preserving order, since different relative expressions can
+        # resolve to the same path
+        return list(dict.fromkeys(os.path.normpath(p) for p in candidates))
 
 
 def resolve_db_path_from_url(database_url):
@@ -78,6 +84,66 @@ def resolve_db_path_from_url(database_url):
         return os.path.abspath(raw_path)
 
 
+def _configure_conn(conn):
+        """
+        Apply performance PRAGMAs to a freshly opened sqlite connection.
+        """
+        # page_size only applies to an empty database and must be set before
+        # WAL is enabled, so it is only attempted on newly created files
+        if conn.execute('SELECT count(*) FROM sqlite_master').fetchone()[0] == 0:
+                conn.execute('PRAGMA page_size=8192')
+        # WAL + NORMAL sync: one fsync per checkpoint instead of per commit
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        # ~16 MB page cache, 256 MB memory-mapped reads, temp b-trees in RAM
+        conn.execute('PRAGMA cache_size=-16000')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA trusted_schema=OFF')
+        return conn
+
+
+# one connection per database file, shared by the load and write steps so the
+# page cache and mmap stay warm and the PRAGMAs are applied only once
+_CONN_CACHE: dict[str, sqlite3.Connection] = {}
+
+
+def _get_conn(db_path):
+        """
+        Return the cached connection for db_path, opening it on first use.
+        """
+        key = os.path.abspath(db_path)
+        conn = _CONN_CACHE.get(key)
+        if conn is None:
+                conn = _CONN_CACHE[key] = _configure_conn(sqlite3.connect(key))
+        return conn
+
+
+def _close_all():
+        """
+        Run PRAGMA optimize on every cached connection and close it, so later
+        runs plan their queries with up-to-date statistics.
+        """
+        while _CONN_CACHE:
+                _, conn = _CONN_CACHE.popitem()
+                conn.execute('PRAGMA optimize')
+                conn.close()
+
+
+atexit.register(_close_all)
+
+
+@contextmanager
+def _open_db(db_path):
+        """
+        Borrow the cached connection for one unit of work, committing on
+        success and rolling back on error.
+        """
+        conn = _get_conn(db_path)
+        with conn:
+                yield conn
+
+
 def list_tables(conn):
         q = "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
         return pd.read_sql_query(q, conn)['name'].tolist()
@@ -90,13 +156,26 @@ def table_columns(conn, table_name):
 
 def infer_input_table(conn):
         # scan all tables and return the first one containing every required column —
-        # avoids hardcoding the table name when the schema is otherwise consistent
-        tables = list_tables(conn)
-        for t in tables:
-                cols = table_columns(conn, t)
-                if REQUIRED_INPUT_COLUMNS.issubset(cols):
-                        return t
-        return None
+        # avoids hardcoding the table name when the schema is otherwise consistent.
+        # one join against pragma_table_info fetches every table's columns at once
+        rows = conn.execute(
+                "SELECT m.name, p.name FROM sqlite_master AS m "
+                "JOIN pragma_table_info(m.name) AS p "
+                "WHERE m.type = 'table' ORDER BY m.name"
+        ).fetchall()
+        columns = {}
+        for table, col in rows:
+                columns.setdefault(table, set()).add(col)
+        return next((t for t, cols in columns.items() if REQUIRED_INPUT_COLUMNS <= cols), None)
+
+
+def _read_chunked(query, conn, dtype=None):
+        """
+        Read a query in INPUT_CHUNK_ROWS batches and stitch them together, so
+        only one batch of DB-API row tuples is alive alongside the frame.
+        """
+        chunks = pd.read_sql_query(query, conn, dtype=dtype, chunksize=INPUT_CHUNK_ROWS)
+        return pd.concat(chunks, ignore_index=True)
 
 
 def load_input_from_db(db_path, source_table=None, source_query=None):
@@ -116,7 +195,7 @@ def load_input_from_db(db_path, source_table=None, source_query=None):
                         'Set ACTIVITY_INPUT_DB_PATH to an existing DB file.'
                 )
 
-        with sqlite3.connect(db_path) as conn:
+        with _open_db(db_path) as conn:
                 tables = list_tables(conn)
                 if source_query:
                         return pd.read_sql_query(source_query, conn)
@@ -136,13 +215,82 @@ def load_input_from_db(db_path, source_table=None, source_query=None):
                                 f'Available tables: {tables}'
                         )
 
-                df = pd.read_sql_query(f'SELECT * FROM "{table_to_use}"', conn)
-                missing = REQUIRED_INPUT_COLUMNS - set(df.columns)
+                available = [row[1] for row in conn.execute(f'PRAGMA table_info("{table_to_use}")')]
+                missing = REQUIRED_INPUT_COLUMNS - set(available)
                 if missing:
                         raise ValueError(
                                 f'Table "{table_to_use}" is missing required columns: {sorted(missing)}'
                         )
-                return df
+
+                # index the control/generation pair so per-generation control
+                # lookups are range scans; PRAGMA optimize at exit records its
+                # statistics. a read-only database simply goes without it
+                try:
+                        conn.execute(
+                                f'CREATE INDEX IF NOT EXISTS "idx_{table_to_use}_ctrl_gen" '
+                                f'ON "{table_to_use}"(Control, Directed_Evolution_Generation)'
+                        )
+                except sqlite3.OperationalError:
+                        pass
+
+                # project only the columns the script uses rather than SELECT *
+                cols = ', '.join(f'"{c}"' for c in available if c in INPUT_COLUMNS)
+                query = f'SELECT {cols} FROM "{table_to_use}"'
+                try:
+                        return _read_chunked(query, conn, dtype=INPUT_DTYPES)
+                except (ValueError, TypeError):
+                        # non-numeric text in a measurement column — read untyped
+                        # and let compute_activity_score coerce it to NaN
+                        return _read_chunked(query, conn)
+
+
+def _score_numpy(dna, dna_b, prot, prot_b):
+        """
+        Per-row protein correction and activity ratio.
+        Returns (protein_corrected, activity_score).
+        """
+        r_protein = np.subtract(prot, prot_b)
+
+        # two-part minimum: absolute floor for near-zero wells,
+        # relative floor for low-but-non-zero expression that is likely noise
+        protein_min = np.maximum(abs_min, sc_min * prot_b)
+        corrected = np.where(r_protein < protein_min, protein_min, r_protein)
+
+        # variants where the cell expressed less protein than the control are
+        # biologically uninterpretable as an activity ratio — the masked
+        # divide leaves them NaN instead of dividing and overwriting afterwards
+        score = np.divide(
+                np.subtract(dna, dna_b), corrected,
+                out=np.full_like(corrected, np.nan), where=r_protein > 0
+        )
+        return corrected, score
+
+
+_score_kernel = _score_numpy
+
+# numba is optional — when available the arithmetic above is fused into one
+# pass with no intermediate arrays; otherwise the NumPy version is used as-is
+try:
+        from numba import njit, prange
+
+        @njit(parallel=True, cache=True)
+        def _score_numba(dna, dna_b, prot, prot_b):
+                n = dna.shape[0]
+                corrected = np.empty(n)
+                score = np.empty(n)
+                for i in prange(n):
+                        r = prot[i] - prot_b[i]
+                        rel = sc_min * prot_b[i]
+                        # written so a NaN baseline propagates like np.maximum
+                        pmin = abs_min if abs_min > rel else rel
+                        c = pmin if r < pmin else r
+                        corrected[i] = c
+                        score[i] = (dna[i] - dna_b[i]) / c if r > 0.0 else np.nan
+                return corrected, score
+
+        _score_kernel = _score_numba
+except ImportError:
+        pass
 
 
 def compute_activity_score(df):
@@ -209,12 +357,17 @@ def compute_activity_score(df):
         if missing:
                 raise ValueError(f'Missing Required Columns: {sorted(missing)}')
 
-        out = df.copy()
+        # shallow copy: only whole columns are (re)assigned below, so the
+        # caller's frame is never mutated and its buffers needn't be duplicated
+        # (pandas >= 3 copy-on-write defers any copy until a write)
+        out = df.copy(deep=False)
 
         # coerce to numeric — SQLite stores values as TEXT by default,
-        # which would silently break arithmetic operations
-        out['DNA_Quantification_fg'] = pd.to_numeric(out['DNA_Quantification_fg'], errors='coerce')
-        out['Protein_Quantification_pg'] = pd.to_numeric(out['Protein_Quantification_pg'], errors='coerce')
+        # which would silently break arithmetic operations. columns that
+        # already arrive numeric (the typed read) skip the conversion pass
+        for col in ('DNA_Quantification_fg', 'Protein_Quantification_pg'):
+                if not pd.api.types.is_numeric_dtype(out[col]):
+                        out[col] = pd.to_numeric(out[col], errors='coerce')
 
         controls = out[out['Control'] == True]
         if controls.empty:
@@ -222,241 +375,152 @@ def compute_activity_score(df):
 
         # median per generation rather than mean — more robust to outlier
         # measurements, which are common in wet lab quantification assays
-        baselines = (
-                controls.groupby('Directed_Evolution_Generation')
-                .agg(
-                        dna_baseline=('DNA_Quantification_fg', 'median'),
-                        protein_baseline=('Protein_Quantification_pg', 'median'),
-                )
-        )
-
-        # right merge keeps only rows with a matching generation baseline —
-        # variants from generations with no control data are excluded
-        out = out.merge(baselines, on='Directed_Evolution_Generation', how='right')
+        baselines = controls.groupby('Directed_Evolution_Generation')[
+                ['DNA_Quantification_fg', 'Protein_Quantification_pg']
+        ].median()
+
+        # variants from generations with no control data are excluded; rows stay
+        # grouped by generation (stable) exactly as the former right merge left them
+        gen = out['Directed_Evolution_Generation']
+        out = out[gen.isin(baselines.index)]
+        if not out['Directed_Evolution_Generation'].is_monotonic_increasing:
+                out = out.sort_values('Directed_Evolution_Generation', kind='stable')
+        out = out.reset_index(drop=True)
+
+        # broadcast each generation's baseline with a map against the small
+        # per-generation table — no hash join build or extra frame copy
+        gen = out['Directed_Evolution_Generation']
+        out['dna_baseline'] = gen.map(baselines['DNA_Quantification_fg'])
+        out['protein_baseline'] = gen.map(baselines['Protein_Quantification_pg'])
 
         # subtract the generation's control baseline to isolate the variant's
         # contribution independent of run-to-run variation
         out['dna_corrected'] = out['DNA_Quantification_fg'] - out['dna_baseline']
 
-        r_protein = out['Protein_Quantification_pg'] - out['protein_baseline']
-        r_min = sc_min * out['protein_baseline']
-
-        # two-part minimum: absolute floor for near-zero wells,
-        # relative floor for low-but-non-zero expression that is likely noise
-        protein_min = np.maximum(abs_min, r_min)
-        out['protein_corrected'] = np.where(r_protein < protein_min, protein_min, r_protein)
+        corrected, score = _score_kernel(
+                out['DNA_Quantification_fg'].to_numpy(dtype=np.float64),
+                out['dna_baseline'].to_numpy(dtype=np.float64),
+                out['Protein_Quantification_pg'].to_numpy(dtype=np.float64),
+                out['protein_baseline'].to_numpy(dtype=np.float64),
+        )
+        out['protein_corrected'] = corrected
+        out['activity_score'] = score
 
-        out['activity_score'] = out['dna_corrected'] / out['protein_corrected']
+        return out
 
-        # variants where the cell expressed less protein than the control are
-        # biologically uninterpretable as an activity ratio — marked NA
-        out.loc[r_protein <= 0, 'activity_score'] = pd.NA
 
-        return out
+# column order doubles as the INSERT order for activity_scores
+ACTIVITY_SCORE_COLUMNS = {
+        'Directed_Evolution_Generation': 'INTEGER',
+        'DNA_Quantification_fg': 'REAL',
+        'Protein_Quantification_pg': 'REAL',
+        'Control': 'INTEGER',
+        'dna_baseline': 'REAL',
+        'protein_baseline': 'REAL',
+        'dna_corrected': 'REAL',
+        'protein_corrected': 'REAL',
+        'activity_score': 'REAL',
+}
 
 
 def write_activity_scores_to_db(scored_df, db_path):
         '''
         Writes computed activity score results to a SQLite database.
-        Uses if_exists='replace' so re-runs always reflect the latest scores.
+        Drops and recreates the table so re-runs always reflect the latest scores.
         '''
-        required_cols = {
-                'Directed_Evolution_Generation',
-                'DNA_Quantification_fg',
-                'Protein_Quantification_pg',
-                'Control',
-                'dna_baseline',
-                'protein_baseline',
-                'dna_corrected',
-                'protein_corrected',
-                'activity_score'
-        }
+        required_cols = tuple(ACTIVITY_SCORE_COLUMNS)
 
         missing = set(required_cols) - set(scored_df.columns)
         if missing:
                 raise ValueError(f'Scored DataFrame Missing Required Columns: {sorted(missing)}')
 
-        with sqlite3.connect(db_path) as conn:
-                scored_df[list(required_cols)].to_sql(
-                        'activity_scores',
-                        conn,
-                        if_exists='replace',
-                        index=False
-                )
-
-
-# ── database path resolution ───────────────────────────────────────────────────
-
-# priority: explicit env var → DATABASE_URL → fallback default
-input_db_path = os.getenv('ACTIVITY_INPUT_DB_PATH')
-if not input_db_path:
-        input_db_path = resolve_db_path_from_url(os.getenv('DATABASE_URL'))
-if not input_db_path:
-        input_db_path = 'database.db'
-
-input_table = os.getenv('ACTIVITY_INPUT_TABLE')
-input_query = os.getenv('ACTIVITY_INPUT_QUERY')
-
-# ── activity score computation ─────────────────────────────────────────────────
-
-x = load_input_from_db(
-        db_path=input_db_path,
-        source_table=input_table if not input_query else None,
-        source_query=input_query
-)
-df = compute_activity_score(x)
-
-debug_mode = os.getenv('ACTIVITY_DEBUG', '0').strip().lower() in {'1', 'true', 'yes'}
-if debug_mode:
-        print(df)
-
-output_db_path = os.getenv('ACTIVITY_OUTPUT_DB_PATH', input_db_path)
-write_activity_scores_to_db(df, output_db_path)
-
-if debug_mode:
-        # how many variants returned NA — typically those with protein below baseline
-        y = df['activity_score'].isna().sum()
-        print('There are', y, 'non-values')
-
-        # inspect which rows are NA and why
-        z = df.loc[df['activity_score'].isna(), ['dna_corrected', 'protein_corrected', 'Control']]
-        print(z)
-
-        # baseline DNA distribution across generations
-        a = df['dna_baseline']
-        print(a)
-
-        # summary statistics for control baselines — sanity check on consistency
-        b = df.loc[df["Control"] == True, "dna_baseline"].describe()
-        print(b)
-
-        # top 10 highest-scoring variants
-        top_10 = df.sort_values(by='activity_score', ascending=False).head(10)
-        print(top_10)
-        print(df["activity_score"].describe())
-
-        top_10_gen = top_10[['Directed_Evolution_Generation', 'activity_score']]
-        print(top_10_gen)
-
-# ── visualisation setup ────────────────────────────────────────────────────────
-
-# column references for the plot — centralised so changes propagate everywhere
-var_col = 'Plasmid_Variant_Index'
-seq_col = 'Protein_Sequence'
-gen_col = 'Directed_Evolution_Generation'
-prt_col = 'protein_corrected'
-act_col = 'activity_score'
-
-# trigram length for amino acid k-mer encoding
-k = 3
-
-initial_z_mode = os.getenv('ACTIVITY_Z_MODE', 'robust').strip().lower()
-if initial_z_mode not in {'raw', 'normalized', 'robust'}:
-        raise ValueError("ACTIVITY_Z_MODE must be 'raw', 'normalized', or 'robust'")
-
-# drop rows with any missing values in the required plot columns —
-# NaN activity scores (uninterpretable variants) are excluded from the landscape
-data = df[[var_col, seq_col, gen_col, prt_col, act_col]].dropna().copy()
-
-# ── sequence embedding ─────────────────────────────────────────────────────────
-
-# amino acid trigrams capture local sequence patterns such as active site motifs
-# without requiring structural data — a lightweight proxy for sequence similarity
-X = CountVectorizer(
-        analyzer='char', ngram_range=(k, k), lowercase=False
-).fit_transform(data[seq_col].astype(str))
-
-embedding_method = os.getenv('ACTIVITY_EMBEDDING_METHOD', 'tsne').strip().lower()
-if embedding_method not in {'tsne', 'pca'}:
-        raise ValueError("ACTIVITY_EMBEDDING_METHOD must be 'tsne' or 'pca'")
-
-# cache the embedding to disk — t-SNE is non-deterministic and expensive;
-# the SHA-1 hash encodes the data and all parameters so the cache
-# automatically invalidates whenever either changes
-cache_root = os.getenv(
-        'ACTIVITY_EMBEDDING_CACHE_DIR',
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'instance', 'embedding_cache')
-)
-os.makedirs(cache_root, exist_ok=True)
-
-sig = hashlib.sha1()
-sig.update(str(k).encode('utf-8'))
-sig.update(embedding_method.encode('utf-8'))
-for s in data[seq_col].astype(str).tolist():
-        sig.update(s.encode('utf-8', errors='ignore'))
-        sig.update(b'|')
-
-if embedding_method == 'tsne':
-        tsne_perplexity = float(os.getenv('ACTIVITY_TSNE_PERPLEXITY', '15'))
-        tsne_max_iter = int(os.getenv('ACTIVITY_TSNE_MAX_ITER', '500'))
-        sig.update(f'{tsne_perplexity}:{tsne_max_iter}'.encode('utf-8'))
-        cache_file = os.path.join(cache_root, f'tsne_{sig.hexdigest()}.npy')
-        if os.path.exists(cache_file):
-                XY = np.load(cache_file)
-        else:
-                # try/except handles the sklearn API change where max_iter
-                # replaced n_iter in newer versions — keeps the script portable
-                try:
-                        XY = TSNE(
-                                n_components=2,
-                                perplexity=tsne_perplexity,
-                                random_state=0,
-                                init='pca',
-                                learning_rate='auto',
-                                max_iter=tsne_max_iter
-                        ).fit_transform(X)
-                except TypeError:
-                        XY = TSNE(
-                                n_components=2,
-                                perplexity=tsne_perplexity,
-                                random_state=0,
-                                init='pca',
-                                learning_rate='auto',
-                                n_iter=tsne_max_iter
-                        ).fit_transform(X)
-                np.save(cache_file, XY)
-else:
-        sig.update(b'pca')
-        cache_file = os.path.join(cache_root, f'pca_{sig.hexdigest()}.npy')
-        if os.path.exists(cache_file):
-                XY = np.load(cache_file)
-        else:
-                # TruncatedSVD is used over standard PCA because the trigram
-                # matrix is sparse — TruncatedSVD operates directly on sparse
-                # matrices without converting to dense, saving memory
-                XY = TruncatedSVD(n_components=2, random_state=0).fit_transform(X)
-                np.save(cache_file, XY)
-
-data['x'] = XY[:, 0]
-data['y'] = XY[:, 1]
+        # box to python scalars and swap NaN/pd.NA for None so sqlite3 can bind them
+        out = scored_df[list(required_cols)].astype(object)
+        out = out.where(out.notna(), None)
+
+        ddl = ', '.join(f'{col} {sql_type}' for col, sql_type in ACTIVITY_SCORE_COLUMNS.items())
+        placeholders = ', '.join('?' * len(required_cols))
+
+        # activity_scores is derived data rebuilt on every run, so the bulk
+        # write skips fsync; the shared connection returns to NORMAL afterwards
+        conn = _get_conn(db_path)
+        conn.execute('PRAGMA synchronous=OFF')
+        try:
+                with _open_db(db_path) as conn:
+                        # explicit BEGIN so the drop, create and insert land in one transaction
+                        conn.execute('BEGIN')
+                        conn.execute('DROP TABLE IF EXISTS activity_scores')
+                        conn.execute(f'CREATE TABLE activity_scores ({ddl})')
+                        conn.executemany(
+                                f'INSERT INTO activity_scores VALUES ({placeholders})',
+                                out.itertuples(index=False, name=None)
+                        )
+        finally:
+                conn.execute('PRAGMA synchronous=NORMAL')
 
-# ── interpolation grid ─────────────────────────────────────────────────────────
 
-# 120x120 grid balances surface resolution against rendering performance
-grid_size = int(os.getenv('ACTIVITY_GRID_SIZE', '120'))
-g_x = np.linspace(data['x'].min(), data['x'].max(), grid_size)
-g_y = np.linspace(data['y'].min(), data['y'].max(), grid_size)
-grid_x, grid_y = np.meshgrid(g_x, g_y)
+def kmer_count_matrix(seqs, k):
+        """
+        Character k-mer counts as a sparse (n_seqs x n_kmers) matrix, identical
+        to CountVectorizer(analyzer='char', ngram_range=(k, k), lowercase=False)
+        but built in one NumPy pass over the concatenated sequence bytes.
+        Falls back to CountVectorizer for non-ASCII or whitespace-containing
+        input, where its text normalisation would differ.
+        """
+        from scipy import sparse
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        joined = ''.join(seqs)
+        if k > 7 or not joined.isascii() or any(c.isspace() for c in set(joined)):
+                return CountVectorizer(
+                        analyzer='char', ngram_range=(k, k), lowercase=False
+                ).fit_transform(seqs)
+
+        buf = np.frombuffer(joined.encode('ascii'), dtype=np.uint8).astype(np.int64)
+        lengths = np.fromiter((len(s) for s in seqs), dtype=np.int64, count=len(seqs))
+        owner = np.repeat(np.arange(len(seqs)), lengths)
+
+        # pack each k-mer's bytes into one integer — byte order is preserved,
+        # so sorting the codes reproduces CountVectorizer's sorted vocabulary
+        n = buf.size - k + 1
+        if n <= 0:
+                return sparse.csr_matrix((len(seqs), 0), dtype=np.int64)
+        codes = np.zeros(n, dtype=np.int64)
+        for j in range(k):
+                codes = (codes << 8) | buf[j:j + n]
+
+        # drop k-mers that would straddle two neighbouring sequences
+        keep = owner[:n] == owner[k - 1:]
+        vocab, cols = np.unique(codes[keep], return_inverse=True)
+        return sparse.csr_matrix(
+                (np.ones(cols.size, dtype=np.int64), (owner[:n][keep], cols)),
+                shape=(len(seqs), vocab.size)
+        )
 
 
 # ── display transform helpers ──────────────────────────────────────────────────
 
-def _display_transform_with_bounds(values, mode, raw_min, raw_max, robust_lo, robust_hi):
+def _display_transform_with_bounds(values, mode, raw_min, raw_max, robust_lo, robust_hi, out=None):
         """
         Transform z values using global bounds so all generations share
         the same colour scale — makes the animation directly comparable
         across generations rather than rescaling per frame.
+
+        Every step after the first runs in place, so a transform allocates
+        at most one array (none when out is given) instead of one per step.
         """
         if mode == 'raw':
                 return values
         if mode == 'robust':
                 # clip to 1st–99th percentile so extreme outliers do not
                 # compress the colour scale and hide meaningful variation
-                return np.clip(values, robust_lo, robust_hi)
+                return np.clip(values, robust_lo, robust_hi, out=out)
         # normalised: rescale to [0, 1] then apply a mild power to
         # spread mid-range values apart visually
-        out = (values - raw_min) / (raw_max - raw_min + 1e-9)
-        return np.clip(out, 0, 1) ** 1.3
+        out = np.subtract(values, raw_min, out=out)
+        np.divide(out, raw_max - raw_min + 1e-9, out=out)
+        np.clip(out, 0, 1, out=out)
+        return np.power(out, 1.3, out=out)
 
 
 def _mode_axis_title(mode):
@@ -469,6 +533,46 @@ def _mode_axis_title(mode):
 
 # ── surface interpolation ──────────────────────────────────────────────────────
 
+def _gaussian_weights(sigma, truncate=4.0):
+        """
+        Normalised 1-D Gaussian taps, built the same way scipy.ndimage does
+        for gaussian_filter so the smoothing result is unchanged.
+        """
+        radius = int(truncate * sigma + 0.5)
+        x = np.arange(-radius, radius + 1)
+        w = np.exp(-0.5 / sigma ** 2 * x ** 2)
+        return w / w.sum()
+
+
+# built once rather than on every smoothing call
+_SMOOTH_WEIGHTS = _gaussian_weights(1.5)
+
+# optional numba kernel for the linear pass: scipy locates each grid point's
+# simplex, then one parallel loop applies the barycentric weights. without
+# numba, LinearNDInterpolator does the same walk over the same triangulation
+_bary_kernel = None
+try:
+        from numba import njit, prange
+
+        @njit(parallel=True, cache=True)
+        def _bary_kernel(simplex_ids, transforms, simplices, values, qpoints, out):
+                for i in prange(qpoints.shape[0]):
+                        s = simplex_ids[i]
+                        if s < 0:
+                                # outside the convex hull — left for the nearest fill
+                                out[i] = np.nan
+                                continue
+                        t = transforms[s]
+                        dx = qpoints[i, 0] - t[2, 0]
+                        dy = qpoints[i, 1] - t[2, 1]
+                        b0 = t[0, 0] * dx + t[0, 1] * dy
+                        b1 = t[1, 0] * dx + t[1, 1] * dy
+                        v = simplices[s]
+                        out[i] = b0 * values[v[0]] + b1 * values[v[1]] + (1.0 - b0 - b1) * values[v[2]]
+except ImportError:
+        pass
+
+
 def surface(df, x_col, y_col, z_col, grid_x, grid_y, mode='raw'):
         """
         Generates an interpolated 3D surface from activity score data.
@@ -493,6 +597,10 @@ def surface(df, x_col, y_col, z_col, grid_x, grid_y, mode='raw'):
         array
                 2D array of smoothed z-values.
         """
+        from scipy.interpolate import LinearNDInterpolator
+        from scipy.ndimage import correlate1d
+        from scipy.spatial import Delaunay, cKDTree
+
         points = np.column_stack([
                 df[x_col].to_numpy(),
                 df[y_col].to_numpy()
@@ -502,209 +610,478 @@ def surface(df, x_col, y_col, z_col, grid_x, grid_y, mode='raw'):
         # linear interpolation chosen over cubic — cubic tends to overshoot
         # between sparse data points, producing spike artefacts that distort
         # the landscape and misrepresent the fitness topology
-        z = griddata(points, values, (grid_x, grid_y), method='linear')
+        tri = Delaunay(points)
+        if _bary_kernel is not None:
+                qpoints = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+                z = np.empty(qpoints.shape[0])
+                _bary_kernel(
+                        tri.find_simplex(qpoints), tri.transform, tri.simplices,
+                        values.astype(np.float64), qpoints, z
+                )
+                z = z.reshape(grid_x.shape)
+        else:
+                z = LinearNDInterpolator(tri, values)(grid_x, grid_y)
 
         # edges of the grid often fall outside the convex hull of the data,
-        # leaving NaNs; nearest-neighbour fill extends the surface to the boundary
-        if np.isnan(z).any():
-                z_near = griddata(points, values, (grid_x, grid_y), method='nearest')
-                z = np.where(np.isnan(z), z_near, z)
+        # leaving NaNs; nearest-neighbour fill extends the surface to the boundary.
+        # only the NaN cells are queried rather than interpolating the whole grid twice
+        outside = np.isnan(z)
+        if outside.any():
+                _, nearest = cKDTree(points).query(np.column_stack([grid_x[outside], grid_y[outside]]))
+                z[outside] = values[nearest]
 
         # Gaussian smoothing converts the piecewise-linear surface into a
         # continuous landscape — sigma=1.5 preserves genuine fitness peaks
-        # while removing interpolation noise between measured variants
-        z = gaussian_filter(z, sigma=1.5)
+        # while removing interpolation noise between measured variants.
+        # float32 is ample for a colour-mapped surface and halves the bytes
+        # the separable filter passes stream through. the two 1-D passes use
+        # the precomputed weights, matching gaussian_filter(sigma=1.5) exactly
+        z = z.astype(np.float32)
+        for axis in (0, 1):
+                z = correlate1d(z, _SMOOTH_WEIGHTS, axis=axis, mode='reflect')
 
         return z
 
 
-# ── frame generation ───────────────────────────────────────────────────────────
+# animation args shared by every slider step and mode button — jump straight
+# to one frame with a redraw and no transition
+_JUMP_TO_FRAME = {'mode': 'immediate', 'frame': {'duration': 0, 'redraw': True}}
+
+_SLIDER_PREFIX = {'robust': 'Robust', 'raw': 'Raw', 'normalized': 'Norm'}
+
+
+def build_landscape(df, debug_mode=False):
+        """
+        Embed the scored variants and show the animated 3D activity landscape.
+        plotly, scipy and sklearn are imported here so that importing the module
+        for compute_activity_score alone does not pay for them.
+        """
+        import plotly.graph_objects as go
+        from scipy import sparse
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.manifold import TSNE
+
+        # ── visualisation setup ────────────────────────────────────────────────
+
+        # column references for the plot — centralised so changes propagate everywhere
+        var_col = 'Plasmid_Variant_Index'
+        seq_col = 'Protein_Sequence'
+        gen_col = 'Directed_Evolution_Generation'
+        prt_col = 'protein_corrected'
+        act_col = 'activity_score'
+
+        # trigram length for amino acid k-mer encoding
+        k = 3
+
+        initial_z_mode = os.getenv('ACTIVITY_Z_MODE', 'robust').strip().lower()
+        if initial_z_mode not in {'raw', 'normalized', 'robust'}:
+                raise ValueError("ACTIVITY_Z_MODE must be 'raw', 'normalized', or 'robust'")
+
+        # drop rows with any missing values in the required plot columns —
+        # NaN activity scores (uninterpretable variants) are excluded from the landscape
+        data = df[[var_col, seq_col, gen_col, prt_col, act_col]].dropna().copy()
+
+        # the plot only needs display precision — float32 halves every
+        # per-generation slice and scatter array built from this frame. the
+        # scores written to the database above stay float64
+        data = data.astype({prt_col: 'float32', act_col: 'float32'})
+
+        # ── sequence embedding ─────────────────────────────────────────────────
+
+        embedding_method = os.getenv('ACTIVITY_EMBEDDING_METHOD', 'tsne').strip().lower()
+        if embedding_method not in {'tsne', 'pca'}:
+                raise ValueError("ACTIVITY_EMBEDDING_METHOD must be 'tsne' or 'pca'")
+
+        # cache the embedding to disk — t-SNE is non-deterministic and expensive;
+        # the SHA-1 hash encodes the data and all parameters so the cache
+        # automatically invalidates whenever either changes
+        cache_root = os.getenv(
+                'ACTIVITY_EMBEDDING_CACHE_DIR',
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'instance', 'embedding_cache')
+        )
+        os.makedirs(cache_root, exist_ok=True)
 
-# convert generation column to numeric in case it was stored as text in SQLite
-data[gen_col] = pd.to_numeric(data[gen_col], errors='coerce')
-frames = []
+        sig = hashlib.sha1()
+        sig.update(str(k).encode('utf-8'))
+        # one update over the joined corpus keeps hashing in C — the byte stream is
+        # the same as hashing each sequence followed by '|', so cache keys are unchanged
+        sig.update(('|'.join(data[seq_col].astype(str).tolist()) + '|').encode('utf-8', errors='ignore'))
 
-gens = sorted(data[gen_col].unique())
-z_modes = ['robust', 'raw', 'normalized']
+        # the trigram matrix depends only on k and the sequences, so its key is
+        # forked off before the embedding parameters are mixed in
+        cv_sig = sig.copy()
+        cv_sig.update(f'cv{k}'.encode('utf-8'))
+        cv_cache_file = os.path.join(cache_root, f'cv_{cv_sig.hexdigest()}.npz')
 
-# compute global bounds once across all generations so each frame uses
-# the same colour scale — prevents the landscape from appearing to shift
-# in intensity between generations during playback
-all_activity = data[act_col].to_numpy(dtype=float)
-raw_min = float(np.nanmin(all_activity))
-raw_max = float(np.nanmax(all_activity))
-robust_lo = float(np.nanpercentile(all_activity, 1))
-robust_hi = float(np.nanpercentile(all_activity, 99))
 
+        def trigram_matrix():
+                """
+                Sparse trigram count matrix for the plotted sequences, cached on disk
+                so warm runs skip tokenisation. Only built when an embedding is missed.
+                """
+                if os.path.exists(cv_cache_file):
+                        return sparse.load_npz(cv_cache_file)
+                # amino acid trigrams capture local sequence patterns such as active site motifs
+                # without requiring structural data — a lightweight proxy for sequence similarity
+                X = kmer_count_matrix(data[seq_col].astype(str).tolist(), k)
+                sparse.save_npz(cv_cache_file, X)
+                return X
 
-def _mode_range(mode):
-        if mode == 'raw':
-                return raw_min, raw_max
-        if mode == 'robust':
-                return robust_lo, robust_hi
-        return 0.0, 1.0
 
+        # t-SNE runs on a dense SVD reduction of the trigram counts — neighbour
+        # search in 50 dimensions is far cheaper than across the full vocabulary
+        tsne_svd_dims = 50
 
-def _frame_name(mode, generation):
-        return f'{mode}:{generation}'
 
+        def tsne_input(X):
+                if X.shape[1] <= tsne_svd_dims:
+                        return X.toarray()
+                return TruncatedSVD(n_components=tsne_svd_dims, random_state=0).fit_transform(X)
 
-# build one frame per (mode × generation) combination —
-# cumulative slicing (gen <= x) shows the landscape growing as new
-# variants are introduced in each directed evolution round
-for mode in z_modes:
-        for gen in gens:
-                da_f = data[data[gen_col] <= gen]
 
-                z_raw = da_f[act_col].to_numpy()
-                z_display = _display_transform_with_bounds(
-                        z_raw, mode, raw_min, raw_max, robust_lo, robust_hi
-                )
-                z_surface = _display_transform_with_bounds(
-                        surface(
-                                df=da_f,
-                                x_col='x',
-                                y_col='y',
-                                z_col=act_col,
-                                grid_x=grid_x,
-                                grid_y=grid_y,
-                                mode=mode
-                        ),
-                        mode, raw_min, raw_max, robust_lo, robust_hi
+        sig.update(embedding_method.encode('utf-8'))
+
+        if embedding_method == 'tsne':
+                tsne_perplexity = float(os.getenv('ACTIVITY_TSNE_PERPLEXITY', '15'))
+                tsne_max_iter = int(os.getenv('ACTIVITY_TSNE_MAX_ITER', '500'))
+
+                # openTSNE is optional — its FFT-accelerated gradient is multi-threaded
+                # and much faster on cold runs; sklearn's TSNE is the fallback
+                try:
+                        from openTSNE import TSNE as OpenTSNE
+                except ImportError:
+                        OpenTSNE = None
+
+                # the backend and the SVD pre-reduction change the layout, so both
+                # are part of the cache key alongside the t-SNE parameters
+                tsne_backend = 'opentsne' if OpenTSNE is not None else 'sklearn'
+                sig.update(f'{tsne_perplexity}:{tsne_max_iter}:{tsne_backend}:svd{tsne_svd_dims}'.encode('utf-8'))
+                cache_file = os.path.join(cache_root, f'tsne_{sig.hexdigest()}.npy')
+                if os.path.exists(cache_file):
+                        XY = np.load(cache_file, mmap_mode='r')
+                else:
+                        X_tsne = tsne_input(trigram_matrix())
+                        if OpenTSNE is not None:
+                                XY = np.asarray(OpenTSNE(
+                                        n_components=2,
+                                        perplexity=tsne_perplexity,
+                                        n_iter=tsne_max_iter,
+                                        initialization='pca',
+                                        negative_gradient_method='fft',
+                                        n_jobs=-1,
+                                        random_state=0
+                                ).fit(X_tsne))
+                        else:
+                                # try/except handles the sklearn API change where max_iter
+                                # replaced n_iter in newer versions — keeps the script portable
+                                try:
+                                        XY = TSNE(
+                                                n_components=2,
+                                                perplexity=tsne_perplexity,
+                                                random_state=0,
+                                                init='pca',
+                                                learning_rate='auto',
+                                                max_iter=tsne_max_iter,
+                                                method='barnes_hut',
+                                                metric='euclidean',
+                                                n_jobs=-1
+                                        ).fit_transform(X_tsne)
+                                except TypeError:
+                                        XY = TSNE(
+                                                n_components=2,
+                                                perplexity=tsne_perplexity,
+                                                random_state=0,
+                                                init='pca',
+                                                learning_rate='auto',
+                                                n_iter=tsne_max_iter,
+                                                method='barnes_hut',
+                                                metric='euclidean',
+                                                n_jobs=-1
+                                        ).fit_transform(X_tsne)
+                        np.save(cache_file, XY)
+        else:
+                sig.update(b'pca')
+                cache_file = os.path.join(cache_root, f'pca_{sig.hexdigest()}.npy')
+                if os.path.exists(cache_file):
+                        XY = np.load(cache_file, mmap_mode='r')
+                else:
+                        # TruncatedSVD is used over standard PCA because the trigram
+                        # matrix is sparse — TruncatedSVD operates directly on sparse
+                        # matrices without converting to dense, saving memory
+                        XY = TruncatedSVD(n_components=2, random_state=0).fit_transform(trigram_matrix())
+                        np.save(cache_file, XY)
+
+        # the cast copies each column out of the (possibly memory-mapped) cache
+        data['x'] = XY[:, 0].astype(np.float32)
+        data['y'] = XY[:, 1].astype(np.float32)
+
+        # ── interpolation grid ─────────────────────────────────────────────────
+
+        # 120x120 grid balances surface resolution against rendering performance
+        grid_size = int(os.getenv('ACTIVITY_GRID_SIZE', '120'))
+        g_x = np.linspace(data['x'].min(), data['x'].max(), grid_size)
+        g_y = np.linspace(data['y'].min(), data['y'].max(), grid_size)
+        grid_x, grid_y = np.meshgrid(g_x, g_y)
+
+
+        # ── frame generation ───────────────────────────────────────────────────
+
+        # convert generation column to numeric in case it was stored as text in SQLite
+        data[gen_col] = pd.to_numeric(data[gen_col], errors='coerce')
+        frames = []
+
+        # stable sort by generation so every cumulative subset (gen <= x) is a
+        # prefix of the frame — sliced by position instead of re-masked per frame
+        data = data.sort_values(gen_col, kind='stable', ignore_index=True)
+        gens = np.unique(data[gen_col].dropna().to_numpy())
+        # slider labels show whole-number generations without a trailing '.0'
+        gen_labels = [int(x) if float(x).is_integer() else x for x in gens]
+        gen_cuts = np.searchsorted(data[gen_col].to_numpy(), gens, side='right')
+        z_modes = ['robust', 'raw', 'normalized']
+
+        # compute global bounds once across all generations so each frame uses
+        # the same colour scale — prevents the landscape from appearing to shift
+        # in intensity between generations during playback
+        all_activity = data[act_col].to_numpy(dtype=float)
+        # one nanpercentile call sorts the data once for all four bounds —
+        # the 0th and 100th percentiles are exactly the min and max
+        raw_min, robust_lo, robust_hi, raw_max = map(
+                float, np.nanpercentile(all_activity, [0, 1, 99, 100])
+        )
+
+
+        def _mode_range(mode):
+                if mode == 'raw':
+                        return raw_min, raw_max
+                if mode == 'robust':
+                        return robust_lo, robust_hi
+                return 0.0, 1.0
+
+
+        def _frame_name(mode, generation):
+                return f'{mode}:{generation}'
+
+
+        # the interpolated surface depends only on a generation's points, not on the
+        # display mode — build it once per generation and only re-transform per mode
+        gen_slices = [data.iloc[:cut] for cut in gen_cuts]
+        gen_surfaces = [
+                surface(
+                        df=da_f,
+                        x_col='x',
+                        y_col='y',
+                        z_col=act_col,
+                        grid_x=grid_x,
+                        grid_y=grid_y
                 )
-                mode_min, mode_max = _mode_range(mode)
-
-                frames.append(go.Frame(
-                        name=_frame_name(mode, gen),
-                        data=[
-                                go.Surface(
-                                        x=g_x,
-                                        y=g_y,
-                                        z=z_surface,
-                                        # partial transparency lets scatter points
-                                        # beneath the surface remain visible
-                                        opacity=0.65,
-                                        colorscale='Hot',
-                                        showscale=True,
-                                        cmin=mode_min,
-                                        cmax=mode_max,
-                                        colorbar=dict(title=_mode_axis_title(mode))
-                                ),
-                                go.Scatter3d(
-                                        x=da_f['x'],
-                                        y=da_f['y'],
-                                        # scatter points plotted at their actual
-                                        # activity score — they sit above or below
-                                        # the surface depending on how well the
-                                        # interpolation matches the real data
-                                        z=z_display,
-                                        customdata=np.column_stack([
-                                                da_f[var_col].to_numpy(),
-                                                da_f[gen_col].to_numpy(),
-                                                da_f[act_col].to_numpy()
-                                        ]),
-                                        hovertemplate=(
-                                                'Variant: %{customdata[0]}<br>' +
-                                                'Generation: %{customdata[1]}<br>' +
-                                                'Activity Score: %{customdata[2]:.3f}<br>' +
-                                                '<extra></extra>'
+                for da_f in gen_slices
+        ]
+
+        # build one frame per (mode × generation) combination —
+        # cumulative slicing (gen <= x) shows the landscape growing as new
+        # variants are introduced in each directed evolution round
+        for mode in z_modes:
+                for gen, da_f, z_gen in zip(gens, gen_slices, gen_surfaces):
+                        z_raw = da_f[act_col].to_numpy()
+                        # float32 throughout the plotted arrays — Plotly ships them as
+                        # typed arrays, so this halves the figure payload the browser parses
+                        z_display = _display_transform_with_bounds(
+                                z_raw, mode, raw_min, raw_max, robust_lo, robust_hi
+                        ).astype(np.float32, copy=False)
+                        z_surface = _display_transform_with_bounds(
+                                z_gen, mode, raw_min, raw_max, robust_lo, robust_hi
+                        ).astype(np.float32, copy=False)
+                        mode_min, mode_max = _mode_range(mode)
+
+                        frames.append(go.Frame(
+                                name=_frame_name(mode, gen),
+                                data=[
+                                        go.Surface(
+                                                x=g_x.astype(np.float32),
+                                                y=g_y.astype(np.float32),
+                                                z=z_surface,
+                                                # partial transparency lets scatter points
+                                                # beneath the surface remain visible
+                                                opacity=0.65,
+                                                colorscale='Hot',
+                                                showscale=True,
+                                                cmin=mode_min,
+                                                cmax=mode_max,
+                                                colorbar=dict(title=_mode_axis_title(mode))
                                         ),
-                                        mode='markers',
-                                        marker=dict(
-                                                size=4,
-                                                opacity=0.5,
-                                                color='mediumpurple',
+                                        go.Scatter3d(
+                                                x=da_f['x'].to_numpy(np.float32),
+                                                y=da_f['y'].to_numpy(np.float32),
+                                                # scatter points plotted at their actual
+                                                # activity score — they sit above or below
+                                                # the surface depending on how well the
+                                                # interpolation matches the real data
+                                                z=z_display,
+                                                customdata=np.column_stack([
+                                                        da_f[var_col].to_numpy(),
+                                                        da_f[gen_col].to_numpy(),
+                                                        da_f[act_col].to_numpy()
+                                                ]),
+                                                hovertemplate=(
+                                                        'Variant: %{customdata[0]}<br>' +
+                                                        'Generation: %{customdata[1]}<br>' +
+                                                        'Activity Score: %{customdata[2]:.3f}<br>' +
+                                                        '<extra></extra>'
+                                                ),
+                                                mode='markers',
+                                                marker=dict(
+                                                        size=4,
+                                                        opacity=0.5,
+                                                        color='mediumpurple',
+                                                )
+                                        )
+                                ],
+                                layout=go.Layout(
+                                        scene=dict(
+                                                zaxis_title=_mode_axis_title(mode),
+                                                zaxis=dict(range=[mode_min, mode_max])
                                         )
                                 )
-                        ],
-                        layout=go.Layout(
-                                scene=dict(
-                                        zaxis_title=_mode_axis_title(mode),
-                                        zaxis=dict(range=[mode_min, mode_max])
+                        ))
+
+        # ── figure layout ──────────────────────────────────────────────────────
+
+        frame_names = {mode: [_frame_name(mode, x) for x in gens] for mode in z_modes}
+        raw_frame_names = frame_names['raw']
+        robust_frame_names = frame_names['robust']
+        norm_frame_names = frame_names['normalized']
+
+        initial_frame_name = _frame_name(initial_z_mode, gens[0])
+        initial_frame = next(f for f in frames if f.name == initial_frame_name)
+
+        fig = go.Figure(
+                data=initial_frame.data,
+                frames=frames
+        )
+
+        fig.update_layout(
+                title='3D Activity Landscape',
+                margin=dict(l=0, r=20, b=0, t=45),
+                scene=dict(
+                        xaxis_title='t-SNE Dim 1',
+                        yaxis_title='t-SNE Dim 2',
+                        zaxis_title=_mode_axis_title(initial_z_mode),
+                        zaxis=dict(range=list(_mode_range(initial_z_mode)))
+                ),
+                # camera positioned to face the fitness peaks on load —
+                # the negative x/y values orient the viewer toward the high-activity region
+                scene_camera=dict(
+                        eye=dict(x=-1.8, y=-1.8, z=1.2),
+                        up=dict(x=0, y=0, z=1)
+                ),
+                # manual aspect ratio flattens the z-axis slightly so the landscape
+                # reads as a terrain rather than a vertical spike chart
+                scene_aspectmode='manual',
+                scene_aspectratio=dict(x=1, y=1, z=0.7),
+                # uirevision prevents the camera from resetting when frames update
+                uirevision='keep',
+                updatemenus=[dict(
+                        type='buttons',
+                        showactive=False,
+                        buttons=[
+                                dict(label='Play Robust', method='animate',
+                                     args=[robust_frame_names, {'frame': {'duration': 500, 'redraw': True}, 'transition': {'duration': 200}}]),
+                                dict(label='Play Raw', method='animate',
+                                     args=[raw_frame_names, {'frame': {'duration': 500, 'redraw': True}, 'transition': {'duration': 200}}]),
+                                dict(label='Play Normalized', method='animate',
+                                     args=[norm_frame_names, {'frame': {'duration': 500, 'redraw': True}, 'transition': {'duration': 200}}]),
+                                dict(label='Robust', method='animate',
+                                     args=[[robust_frame_names[0]], _JUMP_TO_FRAME]),
+                                dict(label='Raw', method='animate',
+                                     args=[[raw_frame_names[0]], _JUMP_TO_FRAME]),
+                                dict(label='Normalized', method='animate',
+                                     args=[[norm_frame_names[0]], _JUMP_TO_FRAME]),
+                                dict(label='Stop', method='animate',
+                                     args=[[None], {'frame': {'duration': 0, 'redraw': False}, 'mode': 'immediate'}])
+                        ]
+                )],
+                sliders=[dict(
+                        currentvalue=dict(prefix='Frame: '),
+                        # one pass over the precomputed names, grouped by mode
+                        steps=[
+                                dict(
+                                        label=f'{_SLIDER_PREFIX[mode]} G{label}',
+                                        method='animate',
+                                        args=[[name], _JUMP_TO_FRAME]
                                 )
-                        )
-                ))
-
-# ── figure layout ──────────────────────────────────────────────────────────────
-
-raw_frame_names = [_frame_name('raw', x) for x in gens]
-robust_frame_names = [_frame_name('robust', x) for x in gens]
-norm_frame_names = [_frame_name('normalized', x) for x in gens]
-
-initial_frame_name = _frame_name(initial_z_mode, gens[0])
-initial_frame = next(f for f in frames if f.name == initial_frame_name)
-
-fig = go.Figure(
-        data=initial_frame.data,
-        frames=frames
-)
-
-fig.update_layout(
-        title='3D Activity Landscape',
-        margin=dict(l=0, r=20, b=0, t=45),
-        scene=dict(
-                xaxis_title='t-SNE Dim 1',
-                yaxis_title='t-SNE Dim 2',
-                zaxis_title=_mode_axis_title(initial_z_mode),
-                zaxis=dict(range=list(_mode_range(initial_z_mode)))
-        ),
-        # camera positioned to face the fitness peaks on load —
-        # the negative x/y values orient the viewer toward the high-activity region
-        scene_camera=dict(
-                eye=dict(x=-1.8, y=-1.8, z=1.2),
-                up=dict(x=0, y=0, z=1)
-        ),
-        # manual aspect ratio flattens the z-axis slightly so the landscape
-        # reads as a terrain rather than a vertical spike chart
-        scene_aspectmode='manual',
-        scene_aspectratio=dict(x=1, y=1, z=0.7),
-        # uirevision prevents the camera from resetting when frames update
-        uirevision='keep',
-        updatemenus=[dict(
-                type='buttons',
-                showactive=False,
-                buttons=[
-                        dict(label='Play Robust', method='animate',
-                             args=[robust_frame_names, {'frame': {'duration': 500, 'redraw': True}, 'transition': {'duration': 200}}]),
-                        dict(label='Play Raw', method='animate',
-                             args=[raw_frame_names, {'frame': {'duration': 500, 'redraw': True}, 'transition': {'duration': 200}}]),
-                        dict(label='Play Normalized', method='animate',
-                             args=[norm_frame_names, {'frame': {'duration': 500, 'redraw': True}, 'transition': {'duration': 200}}]),
-                        dict(label='Robust', method='animate',
-                             args=[[robust_frame_names[0]], {'mode': 'immediate', 'frame': {'duration': 0, 'redraw': True}}]),
-                        dict(label='Raw', method='animate',
-                             args=[[raw_frame_names[0]], {'mode': 'immediate', 'frame': {'duration': 0, 'redraw': True}}]),
-                        dict(label='Normalized', method='animate',
-                             args=[[norm_frame_names[0]], {'mode': 'immediate', 'frame': {'duration': 0, 'redraw': True}}]),
-                        dict(label='Stop', method='animate',
-                             args=[[None], {'frame': {'duration': 0, 'redraw': False}, 'mode': 'immediate'}])
-                ]
-        )],
-        sliders=[dict(
-                currentvalue=dict(prefix='Frame: '),
-                steps=(
-                        [dict(
-                                label=f'Robust G{int(x) if float(x).is_integer() else x}',
-                                method='animate',
-                                args=[[_frame_name("robust", x)], {'mode': 'immediate', 'frame': {'duration': 0, 'redraw': True}}]
-                        ) for x in gens] +
-                        [dict(
-                                label=f'Raw G{int(x) if float(x).is_integer() else x}',
-                                method='animate',
-                                args=[[_frame_name("raw", x)], {'mode': 'immediate', 'frame': {'duration': 0, 'redraw': True}}]
-                        ) for x in gens] +
-                        [dict(
-                                label=f'Norm G{int(x) if float(x).is_integer() else x}',
-                                method='animate',
-                                args=[[_frame_name("normalized", x)], {'mode': 'immediate', 'frame': {'duration': 0, 'redraw': True}}]
-                        ) for x in gens]
-                )
-        )]
-)
+                                for mode in z_modes
+                                for name, label in zip(frame_names[mode], gen_labels)
+                        ]
+                )]
+        )
+
+        fig.show()
+
+        if debug_mode:
+                print(len(fig.data))
+                print(type(fig.data[0]))
+                print(type(fig.data[1]))
+
+
+def main():
+        # ── database path resolution ───────────────────────────────────────────
+
+        # priority: explicit env var → DATABASE_URL → fallback default
+        input_db_path = os.getenv('ACTIVITY_INPUT_DB_PATH')
+        if not input_db_path:
+                input_db_path = resolve_db_path_from_url(os.getenv('DATABASE_URL'))
+        if not input_db_path:
+                input_db_path = 'database.db'
+
+        input_table = os.getenv('ACTIVITY_INPUT_TABLE')
+        input_query = os.getenv('ACTIVITY_INPUT_QUERY')
+
+        # ── activity score computation ─────────────────────────────────────────
+
+        x = load_input_from_db(
+                db_path=input_db_path,
+                source_table=input_table if not input_query else None,
+                source_query=input_query
+        )
+        df = compute_activity_score(x)
+
+        debug_mode = os.getenv('ACTIVITY_DEBUG', '0').strip().lower() in {'1', 'true', 'yes'}
+        if debug_mode:
+                print(df)
+
+        output_db_path = os.getenv('ACTIVITY_OUTPUT_DB_PATH', input_db_path)
+        write_activity_scores_to_db(df, output_db_path)
+
+        if debug_mode:
+                # how many variants returned NA — typically those with protein below baseline
+                y = df['activity_score'].isna().sum()
+                print('There are', y, 'non-values')
+
+                # inspect which rows are NA and why
+                z = df.loc[df['activity_score'].isna(), ['dna_corrected', 'protein_corrected', 'Control']]
+                print(z)
+
+                # baseline DNA distribution across generations
+                a = df['dna_baseline']
+                print(a)
+
+                # summary statistics for control baselines — sanity check on consistency
+                b = df.loc[df["Control"] == True, "dna_baseline"].describe()
+                print(b)
+
+                # top 10 highest-scoring variants
+                top_10 = df.sort_values(by='activity_score', ascending=False).head(10)
+                print(top_10)
+                print(df["activity_score"].describe())
+
+                top_10_gen = top_10[['Directed_Evolution_Generation', 'activity_score']]
+                print(top_10_gen)
+
+        # the landscape is on by default when run as a script; batch scoring
+        # jobs can set ACTIVITY_BUILD_PLOT=0 to skip embedding and plotting
+        if os.getenv('ACTIVITY_BUILD_PLOT', '1').strip().lower() in {'1', 'true', 'yes'}:
+                build_landscape(df, debug_mode)
 
-fig.show()
 
-if debug_mode:
-        print(len(fig.data))
-        print(type(fig.data[0]))
-        print(type(fig.data[1]))
\ No newline at end of file
+if __name__ == '__main__':
+        main()
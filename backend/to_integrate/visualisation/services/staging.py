@@ -6,6 +6,8 @@ from pathlib import Path
 from flask import Blueprint, jsonify, render_template, request
 
 from app.services.fingerprint_db import save_active_experiment
+from app.services.errors import FastaParseError, FastaTooLargeError
+from app.services.sequence_tools import iter_fasta_records
 from app.services.staging import stage_experiment_validate_plasmid
 
 staging_bp = Blueprint("staging", __name__, url_prefix="/staging")
@@ -19,12 +21,40 @@ _EXAMPLE_PLASMID_CANDIDATES = (
 )
 
 
-def _get_plasmid_fasta_from_request() -> str:
+# ~4 Mbp is far beyond any real expression vector (typical: 2–20 kbp); larger
+# uploads are refused before they are fully buffered
+_MAX_PLASMID_BYTES = 4_000_000
+_TOO_LARGE_ERROR = (
+    f"Plasmid FASTA is too large. Maximum supported size is "
+    f"{_MAX_PLASMID_BYTES:,} bytes. Please ensure you have uploaded the correct file."
+)
+_MULTI_RECORD_ERROR = "Expected exactly one DNA sequence"
+
+
+def _read_uploaded_fasta(stream) -> tuple[str, str | None]:
+    # parse the upload straight off the request stream: only the first record
+    # is kept, and a second '>' record stops reading immediately
+    records = iter_fasta_records(stream, max_bytes=_MAX_PLASMID_BYTES)
+    try:
+        first = next(records, None)
+        if first is not None and next(records, None) is not None:
+            return "", _MULTI_RECORD_ERROR
+    except FastaTooLargeError:
+        return "", _TOO_LARGE_ERROR
+    except FastaParseError as exc:
+        return "", str(exc)
+    if first is None:
+        return "", None
+    return f">{first.header}\n{first.seq}\n", None
+
+
+def _get_plasmid_fasta_from_request() -> tuple[str, str | None]:
+    # returns (fasta_text, error); error is set when the upload is rejected
     plasmid_fasta = request.form.get("plasmid_fasta", "").strip()
     uploaded = request.files.get("plasmid_file")
     if uploaded and uploaded.filename:
-        plasmid_fasta = uploaded.read().decode("utf-8", errors="ignore")
-    return plasmid_fasta
+        return _read_uploaded_fasta(uploaded.stream)
+    return plasmid_fasta, None
 
 
 def _coerce_bool(value: object, *, default: bool = False) -> bool:
@@ -67,7 +97,16 @@ def staging_form():
 def staging_submit():
     accession = request.form.get("accession", "").strip().upper()
     fetch_features = _coerce_bool(request.form.get("fetch_features"))
-    plasmid_fasta = _get_plasmid_fasta_from_request()
+    plasmid_fasta, upload_error = _get_plasmid_fasta_from_request()
+
+    if upload_error is not None:
+        return render_template(
+            "staging.html",
+            result={"error": upload_error},
+            accession=accession,
+            plasmid_fasta="",
+            fetch_features=fetch_features,
+        )
 
     if not accession or not plasmid_fasta:
         return render_template(